@@ -9,6 +9,7 @@ from .chromosome import *
 from .individual import *
 from .population import *
 from .multipopulation import *
+from .arraypopulation import *
 from .saga import *
 from .studga import *
 from .pso import *
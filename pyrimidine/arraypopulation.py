@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+
+"""Population stored as a structure of arrays
+
+`ArrayPopulation` keeps the genomes of all the individuals in one matrix
+of shape (n_individuals, n_genes) and their fitness in one vector.
+The genetic operations act on the matrix directly,
+and the individuals are created as views of the rows only when they are needed.
+
+It applies to the individuals encoded by one fixed-length chromosome,
+such as `BinaryChromosome`, `NaturalChromosome` and `FloatChromosome`,
+or `MonoIndividual` of such chromosomes.
+
+`MemmapPopulation` stores the genome matrix in a memory-mapped file,
+for the populations that do not fit in memory.
+
+Example:
+    _evaluate = Knapsack.random(n)
+    MyPopulation = ArrayPopulation[BinaryChromosome // n].set_fitness(_evaluate) // 1000
+    pop = MyPopulation.random()
+    pop.evolve()
+"""
+
+import os
+import pathlib
+import shutil
+import tempfile
+import typing
+import weakref
+from operator import attrgetter
+
+import numpy as np
+
+from .mixin import PopulationMixin, evaluate_batch, is_async, run_sync
+from .meta import MetaMatrix
+from .chromosome import BinaryChromosome
+from . import operators
+
+
+class ArrayPopulation(PopulationMixin, metaclass=MetaMatrix):
+    """Population whose individuals are the rows of a genome matrix
+
+    The counterpart of `StandardPopulation` (select, mate, mutate and keep the elders),
+    where the operations are performed as array operations.
+
+    Caution:
+        `pop[k]` is a view of the k-th row; call `pop.clear_cache()`
+        if you change it in place.
+
+    Attributes:
+        genomes (array): the genome matrix of shape (n_individuals, n_genes)
+
+    Params:
+        n_elders: the number (or rate) of the last generation
+        crossover: the crossover method (see `operators.crossover`)
+    """
+
+    element_class = BinaryChromosome
+    default_size = 20
+
+    params = {'mate_prob':0.75, 'mutate_prob':0.2, 'tourn_size':5, 'selection':'tournament',
+        'crossover':'one_point', 'crossover_params':{}, 'n_elders':0.5}
+
+    alias = {"individuals": "elements",
+        "n_individuals": "n_elements",
+        "best_individual": "best_element",
+        "worst_individual": "worst_element",
+        "best_individuals": "best_elements",
+        "get_best_individual": "get_best_element",
+        "get_best_individuals": "get_best_elements"
+    }
+
+    def __init__(self, elements=None, fitness=None):
+        """
+        Args:
+            elements (array | list, optional): the genome matrix or a list of individuals
+            fitness (array, optional): the fitness of the individuals, if it is known
+        """
+
+        if elements is None or len(elements) == 0:
+            genomes = np.empty((0, self.chromosome_class().default_size))
+        elif isinstance(elements, np.ndarray) and elements.ndim == 2:
+            genomes = np.asarray(elements)
+        else:
+            genomes = np.stack([np.asarray(self._genome(e)) for e in elements])
+        self.genomes = genomes
+        n = len(genomes)
+        if fitness is None:
+            self._fitness_values = np.empty(n)
+            self._evaluated = np.zeros(n, dtype=bool)
+        else:
+            self._fitness_values = np.asarray(fitness, dtype=float).copy()
+            self._evaluated = np.ones(n, dtype=bool)
+
+    @classmethod
+    def chromosome_class(cls):
+        # the class of the chromosome encoding the rows
+        if issubclass(cls.element_class, np.ndarray):
+            return cls.element_class
+        else:
+            return cls.element_class.element_class
+
+    @staticmethod
+    def _genome(e):
+        if isinstance(e, np.ndarray):
+            return e
+        elif hasattr(e, 'chromosome'):
+            return e.chromosome
+        else:
+            return e[0]
+
+    @classmethod
+    def random(cls, n_elements=None, size=None, **kwargs):
+        """Generate a population randomly
+
+        Args:
+            n_elements (int, optional): the number of individuals (or use its alias)
+            size (int, optional): the number of genes
+        """
+
+        for k, v in kwargs.items():
+            if k in cls.alias and cls.alias[k] == 'n_elements':
+                n_elements = v
+        n_elements = n_elements or cls.default_size
+        C = cls.chromosome_class()
+        size = size or C.default_size
+        return cls(np.asarray(C.random(size=(n_elements, size))))
+
+    def _view(self, k):
+        # the k-th individual as a view of the k-th row
+        c = self.genomes[k].view(self.chromosome_class())
+        if issubclass(self.element_class, np.ndarray):
+            return c
+        else:
+            return self.element_class([c])
+
+    def __len__(self):
+        return len(self.genomes)
+
+    def __iter__(self):
+        return (self._view(k) for k in range(len(self)))
+
+    def __getitem__(self, k):
+        if isinstance(k, (int, np.integer)):
+            return self._view(k)
+        elif isinstance(k, slice):
+            return [self._view(i) for i in range(len(self))[k]]
+        else:
+            return [self._view(i) for i in k]
+
+    def __setitem__(self, k, v):
+        self.genomes[k] = np.asarray(self._genome(v))
+        self._evaluated[k] = False
+
+    def __str__(self):
+        return '&\n'.join(map(str, self))
+
+    @property
+    def n_elements(self):
+        return len(self.genomes)
+
+    @property
+    def n_genes(self):
+        return self.genomes.shape[1]
+
+    @property
+    def elements(self):
+        return list(self)
+
+    @elements.setter
+    def elements(self, x):
+        self.genomes = np.stack([np.asarray(self._genome(e)) for e in x])
+        self._fitness_values = np.empty(len(self.genomes))
+        self._evaluated = np.zeros(len(self.genomes), dtype=bool)
+
+    def init(self):
+        pass
+
+    def clear_cache(self):
+        super().clear_cache()
+        self._evaluated[:] = False
+
+    def after_setter(self):
+        self.clear_cache()
+
+    def get_all_fitness(self):
+        # evaluate the individuals whose fitness is unknown
+        ks = np.flatnonzero(~self._evaluated)
+        if ks.size:
+            self._evaluate(ks)
+        return self._fitness_values
+
+    def _evaluate(self, ks):
+        # evaluate the individuals indexed by `ks`, with `_fitness_batch` if it is defined
+        if hasattr(self.element_class, '_fitness_batch'):
+            genomes = np.asarray(self.genomes[ks])
+            self._fitness_values[ks] = evaluate_batch(self.element_class, genomes, genomes)
+        elif is_async(self.element_class):
+            self._fitness_values[ks] = run_sync(self._gather_fitness(list(map(self._view, ks))))
+        else:
+            self._fitness_values[ks] = list(self.map(attrgetter('fitness'), map(self._view, ks)))
+        self._evaluated[ks] = True
+
+    async def aget_all_fitness(self, max_concurrency=None):
+        # evaluate the individuals whose fitness is unknown concurrently
+        ks = np.flatnonzero(~self._evaluated)
+        if ks.size:
+            if hasattr(self.element_class, '_fitness_batch'):
+                self._evaluate(ks)
+                return self._fitness_values
+            self._fitness_values[ks] = await self._gather_fitness(list(map(self._view, ks)), max_concurrency)
+            self._evaluated[ks] = True
+        return self._fitness_values
+
+    def _take(self, ks):
+        # keep the individuals indexed by `ks` only
+        self.genomes = self.genomes[ks]
+        self._fitness_values = self._fitness_values[ks]
+        self._evaluated = self._evaluated[ks]
+
+    def _append(self, genomes, fitness=None):
+        # append rows to the genome matrix
+        self.genomes = np.concatenate((self.genomes, genomes), axis=0)
+        self._fitness_values = np.concatenate((self._fitness_values,
+            np.empty(len(genomes)) if fitness is None else fitness))
+        self._evaluated = np.concatenate((self._evaluated,
+            np.full(len(genomes), fitness is not None)))
+
+    def _best_indexes(self, n=1):
+        # indexes of the best n individuals, in increasing order of fitness
+        if n < 1:
+            n = int(self.n_elements * n)
+        elif not isinstance(n, int):
+            n = int(n)
+        if n == 0:
+            return np.array([], dtype=int)
+        f = self.get_all_fitness()
+        if n >= len(f):
+            return np.argsort(f)
+        ks = np.argpartition(f, -n)[-n:]
+        return ks[np.argsort(f[ks])]
+
+    def get_best_elements(self, n=1, copy=False):
+        ks = self._best_indexes(n)
+        if copy:
+            return [self._view(k).copy() for k in ks]
+        else:
+            return [self._view(k) for k in ks]
+
+    def transition(self, *args, **kwargs):
+        ks = self._best_indexes(self.n_elders)
+        elders, elder_fitness = self.genomes[ks], self._fitness_values[ks]
+        self.select()
+        self.mate()
+        self.mutate()
+        self._append(elders, elder_fitness)
+
+    def select(self, n_sel=None, tourn_size=None, selection=None):
+        """Select the individuals, as `BasePopulation.select`
+
+        Select the best individual among `tourn_size` randomly chosen
+        individuals, `n_sel` times, without replacement, by default.
+        """
+
+        if n_sel is None:
+            n_sel = self.default_size
+        elif 0 < n_sel < 1:
+            n_sel = int(self.n_individuals * n_sel)
+        if n_sel >= self.n_individuals:
+            return
+        winners = operators.select(self.get_all_fitness(), n_sel,
+            selection=selection or self.selection, tourn_size=tourn_size or self.tourn_size)
+        self._take(winners)
+
+    def mate(self, mate_prob=None, crossover=None, **kwargs):
+        """Mate the neighbouring individuals, with one-point crossover by default
+
+        Args:
+            mate_prob (float, optional): the proba. of mating
+            crossover (str | function, optional): the crossover method (see `operators.crossover`)
+            **kwargs: the parameters of the crossover method, updating the param `crossover_params`
+
+        Returns:
+            array: the genomes of the offspring
+        """
+
+        mate_prob = mate_prob or self.mate_prob
+        ks = np.flatnonzero(np.random.random(self.n_individuals-1) < mate_prob)
+        offspring = operators.crossover(self.genomes, np.column_stack((ks, ks+1)), crossover or self.crossover,
+            **{**self.crossover_params, **kwargs})
+        self._append(offspring)
+        return offspring
+
+    def mutate(self, mutate_prob=None, *args, **kwargs):
+        """Mutate the rows selected with the proba. `mutate_prob`
+
+        The rows are mutated as one block by the method `mutate` of the chromosome class.
+        """
+
+        mutate_prob = mutate_prob or self.mutate_prob
+        ks = np.flatnonzero(np.random.random(self.n_individuals) < mutate_prob)
+        if ks.size:
+            block = self.genomes[ks].view(self.chromosome_class())
+            block.mutate(*args, **kwargs)
+            self.genomes[ks] = block
+            self._evaluated[ks] = False
+
+    def merge(self, other, n_sel=None):
+        if isinstance(other, ArrayPopulation):
+            other.get_all_fitness()
+            self._append(other.genomes, other._fitness_values)
+        elif isinstance(other, typing.Iterable):
+            self.extend(other)
+        else:
+            raise TypeError("`other` should be a population or a list/tuple of individuals")
+
+        if n_sel:
+            self.select(n_sel)
+
+    def extend(self, inds):
+        if isinstance(inds, np.ndarray) and inds.ndim == 2:
+            self._append(inds)
+        else:
+            inds = list(inds)
+            if inds:
+                self._append(np.stack([np.asarray(self._genome(e)) for e in inds]))
+
+    def append(self, ind):
+        self._append(np.asarray(self._genome(ind))[None, :])
+
+    def pop(self, k=-1):
+        ind = self._view(k).copy()
+        self._take(np.delete(np.arange(len(self)), k))
+        return ind
+
+    def remove(self, individual):
+        g = np.asarray(self._genome(individual))
+        ks = np.flatnonzero(np.all(self.genomes == g, axis=1))
+        if ks.size == 0:
+            raise ValueError('The individual is not in the population.')
+        self.pop(ks[0])
+
+    def sort(self):
+        self._take(self.argsort())
+
+    def argsort(self):
+        return np.argsort(self.get_all_fitness())
+
+    def drop(self, n=1):
+        if n < 1:
+            n = int(self.n_elements * n)
+        elif not isinstance(n, int):
+            n = int(n)
+        self._take(self.argsort()[n:])
+
+    def copy(self, type_=None, *args, **kwargs):
+        type_ = type_ or self.__class__
+        if isinstance(type_, type) and issubclass(type_, ArrayPopulation):
+            cpy = type_(self.genomes.copy())
+            cpy._fitness_values = self._fitness_values.copy()
+            cpy._evaluated = self._evaluated.copy()
+            return cpy
+        else:
+            return type_([self._view(k).copy() for k in range(len(self))])
+
+    def clone(self):
+        return self.copy()
+
+
+class MemmapPopulation(ArrayPopulation):
+    """Population whose genome matrix is stored in a memory-mapped file
+
+    The counterpart of `ArrayPopulation` for the populations that do not fit in memory.
+    Selection, mating, mutation and evaluation stream over the genome matrix in blocks
+    of `block_size` rows, so only the fitness vector and one block are kept in memory.
+
+    The selected rows are gathered into a swap file, which then replaces the file.
+    The files are deleted with the population, if `filename` is not given.
+
+    Example:
+        MyPopulation = MemmapPopulation[FloatChromosome // 1000].set_fitness(_evaluate) // 1000000
+        pop = MyPopulation.random(filename='genomes.dat')
+
+    Params:
+        block_size: the number of the rows processed at once
+    """
+
+    params = {'block_size': 4096}
+
+    def __init__(self, elements=None, fitness=None, filename=None):
+        """
+        Args:
+            elements (array | list, optional): the genome matrix or a list of individuals
+            fitness (array, optional): the fitness of the individuals, if it is known
+            filename (str | Path, optional): the file storing the genome matrix,
+                a file in a temporary folder by default
+        """
+
+        if filename is None:
+            tmpdir = tempfile.mkdtemp(prefix='pyrimidine-')
+            filename = pathlib.Path(tmpdir) / 'genomes.dat'
+            self._finalizer = weakref.finalize(self, shutil.rmtree, tmpdir, True)
+        self.filename = pathlib.Path(filename)
+        self._store = None
+        self._n = 0
+        super().__init__(elements, fitness)
+
+    @classmethod
+    def random(cls, n_elements=None, size=None, filename=None, **kwargs):
+        """Generate a population randomly, block by block
+
+        Args:
+            n_elements (int, optional): the number of individuals (or use its alias)
+            size (int, optional): the number of genes
+            filename (str | Path, optional): the file storing the genome matrix
+        """
+
+        for k, v in kwargs.items():
+            if k in cls.alias and cls.alias[k] == 'n_elements':
+                n_elements = v
+        n_elements = n_elements or cls.default_size
+        C = cls.chromosome_class()
+        size = size or C.default_size
+        pop = cls(filename=filename)
+        for k in range(0, n_elements, pop.block_size):
+            m = min(pop.block_size, n_elements - k)
+            pop._append(np.asarray(C.random(size=(m, size))))
+        return pop
+
+    def _open(self, n_rows, n_genes, dtype, mode='r+', filename=None):
+        # memory-map the file as a matrix with `n_rows` rows (at least one row)
+        return np.memmap(filename or self.filename, dtype=dtype, mode=mode, shape=(max(n_rows, 1), n_genes))
+
+    def _reserve(self, n_rows, n_genes, dtype):
+        # make sure that the file could hold `n_rows` rows; grow it geometrically
+        if self._store is None or (self._n == 0 and (self._store.shape[1] != n_genes or self._store.dtype != dtype)):
+            self._store = self._open(n_rows, n_genes, dtype, mode='w+')
+        elif n_rows > len(self._store):
+            capacity = max(n_rows, 2 * len(self._store))
+            n_genes, dtype = self._store.shape[1], self._store.dtype
+            self._store.flush()
+            self._store = None
+            with open(self.filename, 'r+b') as fo:
+                fo.truncate(capacity * n_genes * dtype.itemsize)
+            self._store = self._open(capacity, n_genes, dtype)
+
+    @property
+    def genomes(self):
+        return self._store[:self._n]
+
+    @genomes.setter
+    def genomes(self, x):
+        self._n = 0
+        self._reserve(len(x), x.shape[1], x.dtype)
+        for k in range(0, len(x), self.block_size):
+            block = x[k:k+self.block_size]
+            self._store[k:k+len(block)] = block
+        self._n = len(x)
+
+    def _blocks(self, ks):
+        # split the indexes into blocks
+        return (ks[k:k+self.block_size] for k in range(0, len(ks), self.block_size))
+
+    def get_all_fitness(self):
+        # evaluate the individuals whose fitness is unknown, block by block
+        for ks in self._blocks(np.flatnonzero(~self._evaluated)):
+            self._evaluate(ks)
+        return self._fitness_values
+
+    def _take(self, ks):
+        # gather the rows into the swap file block by block, which then replaces the file
+        ks = np.asarray(ks, dtype=int)
+        n_genes, dtype = self.n_genes, self._store.dtype
+        swap = self.filename.with_name(self.filename.name + '.swap')
+        store = self._open(len(ks), n_genes, dtype, mode='w+', filename=swap)
+        for k in range(0, len(ks), self.block_size):
+            store[k:k+self.block_size] = self._store[ks[k:k+self.block_size]]
+        store.flush()
+        del store
+        self._store = None
+        os.replace(swap, self.filename)
+        self._store = self._open(len(ks), n_genes, dtype)
+        self._n = len(ks)
+        self._fitness_values = self._fitness_values[ks]
+        self._evaluated = self._evaluated[ks]
+
+    def _append(self, genomes, fitness=None):
+        # append rows to the file
+        n = self._n
+        self._reserve(n + len(genomes), genomes.shape[1], genomes.dtype)
+        for k in range(0, len(genomes), self.block_size):
+            block = genomes[k:k+self.block_size]
+            self._store[n+k:n+k+len(block)] = block
+        self._n = n + len(genomes)
+        self._fitness_values = np.concatenate((self._fitness_values,
+            np.empty(len(genomes)) if fitness is None else fitness))
+        self._evaluated = np.concatenate((self._evaluated,
+            np.full(len(genomes), fitness is not None)))
+
+    def transition(self, *args, **kwargs):
+        # keep the elders at the front of the file, instead of holding them in memory
+        elders = self._best_indexes(self.n_elders)
+        if self.default_size < self.n_individuals:
+            winners = operators.select(self.get_all_fitness(), self.default_size,
+                selection=self.selection, tourn_size=self.tourn_size)
+        else:
+            winners = np.arange(self.n_individuals)
+        self._take(np.concatenate((elders, winners)))
+        self.mate(start=len(elders))
+        self.mutate(start=len(elders))
+
+    def mate(self, mate_prob=None, crossover=None, start=0, **kwargs):
+        """Mate the neighbouring individuals, block by block
+
+        Args:
+            mate_prob (float, optional): the proba. of mating
+            crossover (str | function, optional): the crossover method (see `operators.crossover`)
+            start (int, optional): the rows before `start` are not involved
+            **kwargs: the parameters of the crossover method, updating the param `crossover_params`
+        """
+
+        mate_prob = mate_prob or self.mate_prob
+        kwargs = {**self.crossover_params, **kwargs}
+        ks = start + np.flatnonzero(np.random.random(max(self.n_individuals-start-1, 0)) < mate_prob)
+        for kb in self._blocks(ks):
+            self._append(operators.crossover(self.genomes, np.column_stack((kb, kb+1)), crossover or self.crossover, **kwargs))
+
+    def mutate(self, mutate_prob=None, start=0, *args, **kwargs):
+        """Mutate the rows selected with the proba. `mutate_prob`, block by block
+
+        Args:
+            mutate_prob (float, optional): the proba. of mutation
+            start (int, optional): the rows before `start` are not mutated
+        """
+
+        mutate_prob = mutate_prob or self.mutate_prob
+        ks = start + np.flatnonzero(np.random.random(self.n_individuals-start) < mutate_prob)
+        for kb in self._blocks(ks):
+            block = np.asarray(self.genomes[kb]).view(self.chromosome_class())
+            block.mutate(*args, **kwargs)
+            self.genomes[kb] = block
+            self._evaluated[kb] = False
+
+    def copy(self, type_=None, filename=None, *args, **kwargs):
+        type_ = type_ or self.__class__
+        if isinstance(type_, type) and issubclass(type_, MemmapPopulation):
+            cpy = type_(filename=filename)
+            cpy._append(self.genomes)
+            cpy._fitness_values = self._fitness_values.copy()
+            cpy._evaluated = self._evaluated.copy()
+            return cpy
+        else:
+            return super().copy(type_, *args, **kwargs)
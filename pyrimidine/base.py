@@ -68,6 +68,7 @@ from .meta import *
 from .mixin import *
 
 from .deco import side_effect
+from . import operators
 
 
 class BaseGene:
@@ -84,7 +85,10 @@ class BaseGene:
 
     @classmethod
     def random(cls, *args, **kwargs):
-        return cls(np.random.choice(cls.values, *args, **kwargs))
+        # sample a gene, or an array of genes in one batch if `size` is given
+        if args or 'size' in kwargs:
+            return np.random.choice(cls.values, *args, **kwargs)
+        return cls(np.random.choice(cls.values))
 
 
 class BaseChromosome(FitnessMixin, metaclass=MetaArray):
@@ -190,7 +194,7 @@ class BaseIndividual(FitnessMixin, metaclass=MetaContainer):
         if hasattr(self, 'environment'):
             return self.environment.evaluate(self)
         else:
-            raise NotImplementedError
+            return super()._fitness()
 
     def transition(self, *args, **kwargs):
         self.mutate()
@@ -270,7 +274,8 @@ class BasePopulation(PopulationMixin, metaclass=MetaContainer):
     element_class = BaseIndividual
     default_size = 20
 
-    params = {'mate_prob':0.75, 'mutate_prob':0.2, 'tourn_size':5}
+    params = {'mate_prob':0.75, 'mutate_prob':0.2, 'tourn_size':5, 'selection':'tournament', 'crossover':None,
+        'crossover_params':{}}
 
     alias = {"individuals": "elements",
         "n_individuals": "n_elements",
@@ -302,11 +307,18 @@ class BasePopulation(PopulationMixin, metaclass=MetaContainer):
         """
         raise NotImplementedError
 
-    def select(self, n_sel=None, tourn_size=None):
+    def select(self, n_sel=None, tourn_size=None, selection=None):
         """The standard method of selecting operation in GA
         
         Select the best individual among `tourn_size` randomly chosen
-        individuals, `n_sel` times.
+        individuals, `n_sel` times, by default.
+
+        Args:
+            n_sel (int | float, optional): the number (or rate) of the selected individuals
+            tourn_size (int, optional): the size of each tournament
+            selection (str, optional): the selection method (see `operators.select`),
+                'tournament' (without replacement), 'tournament_with_replacement',
+                'stochastic_universal_sampling' or 'truncation'
         """
 
         if n_sel is None:
@@ -315,27 +327,20 @@ class BasePopulation(PopulationMixin, metaclass=MetaContainer):
             n_sel = int(self.n_individuals * n_sel)
         if n_sel >= self.n_individuals:
             return
-        winners = []
-        rest = list(range(self.n_individuals))
-        size = tourn_size or self.tourn_size
-        n_rest = self.n_individuals
-
-        for i in range(n_sel):
-            if n_rest == 0:
-                break
-            elif n_rest <= size:
-                aspirants = rest
-            else:
-                aspirants = np.random.choice(rest, size, replace=False)
-            _winner = np.argmax([self[k].fitness for k in aspirants])
-            winner = aspirants[_winner]
-            winners.append(winner)
-            rest.remove(winner)
-            n_rest -= 1
-        if winners:
-            self.individuals = [self[k] for k in winners]
-        else:
+        winners = operators.select(self.get_all_fitness(), n_sel,
+            selection=selection or self.selection, tourn_size=tourn_size or self.tourn_size)
+        if winners.size == 0:
             raise Exception('No winners in the selection!')
+        # an individual selected repeatedly is copied
+        individuals = []
+        selected = set()
+        for k in winners:
+            if k in selected:
+                individuals.append(self[k].copy())
+            else:
+                individuals.append(self[k])
+                selected.add(k)
+        self.individuals = individuals
 
     def merge(self, other, n_sel=None):
         """Merge two populations.
@@ -369,21 +374,44 @@ class BasePopulation(PopulationMixin, metaclass=MetaContainer):
             if random() < (mutate_prob or self.mutate_prob):
                 individual.mutate()
 
-    def mate(self, mate_prob=None):
+    def mate(self, mate_prob=None, crossover=None, **kwargs):
         """To mate the entire population.
 
-        Just call the method `mate` of each individual (customizing anthor individual)
+        Just call the method `cross` of each individual (customizing anthor individual),
+        unless the crossover method is given by the argument or the param `crossover`;
+        then the offspring of all the pairs are produced in one block (see `operators.crossover`),
+        if each individual is encoded by one vector.
         
         Keyword Arguments:
             mate_prob {number} -- the proba. of mating of two individuals (default: {None})
+            crossover {str|function} -- the crossover method (default: {None})
+            **kwargs -- the parameters of the crossover method, updating the param `crossover_params`
         """
         
         mate_prob = mate_prob or self.mate_prob
+        crossover = crossover or self.crossover
+        if crossover:
+            genomes = stack(self.elements)
+            if isinstance(genomes, np.ndarray) and genomes.ndim == 2:
+                ks = np.flatnonzero(np.random.random(self.n_individuals-1) < mate_prob)
+                block = operators.crossover(genomes, np.column_stack((ks, ks+1)), crossover,
+                    **{**self.crossover_params, **kwargs})
+                offspring = [self._from_genome(self[k], g) for k, g in zip(ks, block)]
+                self.extend(offspring)
+                return offspring
         offspring = [individual.cross(other_individual) for individual, other_individual in zip(self[:-1], self[1:])
         if random() < mate_prob]
         self.extend(offspring)
         return offspring
 
+    @staticmethod
+    def _from_genome(parent, genome):
+        # create an individual of the same type as the parent, encoded by the genome
+        if isinstance(parent, np.ndarray):
+            return parent.__class__(genome)
+        else:
+            return parent.__class__([parent.chromosome.__class__(genome)])
+
     def mate_with(self, other, mate_prob=None):
         mate_prob = mate_prob or self.mate_prob
         offspring = [individual.cross(other_individual) for individual, other_individual in product(self, other)
@@ -404,42 +432,40 @@ class BasePopulation(PopulationMixin, metaclass=MetaContainer):
     def get_rank(self, individual):
         """Get rank of one individual
 
-        Use `rank` if you call it frequently.
+        The rank is the proportion of the individuals not better than it,
+        found by binary search in the sorted fitness.
         """
 
-        r = 0
-        for ind in self.sorted_():
-            if ind.fitness <= individual.fitness:
-                r += 1
-            else:
-                break
+        *_, sorted_fitness = self._sorted_fitness()
+        r = np.searchsorted(sorted_fitness, individual.fitness, side='right')
         individual.ranking = r / self.n_individuals
         return individual.ranking
 
-    def rank(self, tied=False):
+    def rank(self, tied=False, dense=False):
         """To rank all individuals by the fitness increasingly
         
         Args:
-            tied (bool, optional): for tied ranking
+            tied (bool, optional): for tied ranking,
+                where the individuals with the same fitness get the highest rank of them
+            dense (bool, optional): for dense ranking,
+                where the rank is the number of the distinct values of fitness lower than it
+
+        Returns:
+            array: the rankings of the individuals
         """
-        
-        sorted_list = self.sorted_()
+
+        fitness, order, sorted_fitness = self._sorted_fitness()
         if tied:
-            k = 0
-            while k < self.n_individuals:
-                r = 0
-                individual = sorted_list[k]
-                for i in sorted_list[k+1:]:
-                    if i.fitness == individual.fitness:
-                        r += 1
-                    else:
-                        break
-                for i in sorted_list[k:k+r+1]:
-                    i.ranking = (r + k) / self.n_individuals
-                k += r + 1
+            ranks = np.searchsorted(sorted_fitness, fitness, side='right') - 1
+        elif dense:
+            ranks = np.searchsorted(np.unique(sorted_fitness), fitness)
         else:
-            for k, i in enumerate(sorted_list):
-                i.ranking = k / self.n_individuals
+            ranks = np.empty(len(order), dtype=int)
+            ranks[order] = np.arange(len(order))
+        rankings = ranks / self.n_individuals
+        for i, r in zip(self, rankings):
+            i.ranking = r
+        return rankings
 
     def cross(self, other):
         # Cross two populations as two individuals
@@ -492,6 +518,10 @@ class BaseMultiPopulation(PopulationMixin, metaclass=MetaHighContainer):
         for p in self:
             p.transition(*args, **kwargs)
 
+    def get_all_fitness(self):
+        # the fitness of the populations, which cache their own fitness vectors
+        return np.asarray(self._get_fitness(self.elements))
+
     @side_effect
     def select(self):
         for p in self:
@@ -62,14 +62,15 @@ class Knapsack(BaseProblem):
         return self.__sorted
 
     def __call__(self, x):
-        # x is a binary array
+        # x is a binary array, or a matrix whose rows are binary arrays;
+        # only the first min(len(x), n_bags) goods are considered, as `zip` does
+        x = np.asarray(x)
         c, w, W, M = self.c, self.w, self.W, self.M
-        v = np.sum([ci for i, ci in zip(x, c) if i==1])
-        w = np.sum([wi for i, wi in zip(x, w) if i==1])
-        if  w <= W:
-            return v
-        else:
-            return - 1/(1 + np.exp(-v)) * M
+        n = min(x.shape[-1], len(c))
+        x = x[..., :n]
+        v = x @ c[:n]
+        w = x @ w[:n]
+        return np.where(w <= W, v, - 1/(1 + np.exp(-v)) * M)[()]
 
         # a = np.array([1,2,3,4,5,6,1,1,1,1])
         # return np.sum(a[x==1])
@@ -7,7 +7,7 @@ A chromosome is an array of genes, or it can be customized by the user.
 It could be a part of an individual or encodes a solution directly.
 """
 
-from random import choice, randint, gauss, random
+from random import choice, randint, random
 
 import numpy as np
 from scipy.stats import norm
@@ -19,6 +19,21 @@ from .utils import *
 from .deco import side_effect
 
 
+def _sample(chromosome, ks):
+    """Sample the new values of the genes indexed by `ks` in one batch
+
+    Only the genes indexed by `ks` are drawn, by `random(size=len(ks))` of the gene class
+    (see `BaseGene.random`); if the chromosome has no gene class (e.g. the typecode of `ArrayChromosome`),
+    then they are taken from a random chromosome.
+    """
+
+    element_class = chromosome.element_class
+    if isinstance(element_class, type) and hasattr(element_class, 'random'):
+        return element_class.random(size=len(ks))
+    a = chromosome.random()
+    return [a[k] for k in ks]
+
+
 def _asarray(out):
     return np.asarray(out) if isinstance(out, np.ndarray) else out
 
@@ -123,10 +138,10 @@ class NumpyArrayChromosome(BaseChromosome, np.ndarray):
 
     @side_effect
     def mutate(self, indep_prob=0.1):
-        # mutation
-        for i in range(len(self)):
-            if random() < indep_prob:
-                self[i] = self.element_class.random()
+        # mutation: the genes selected by a Bernoulli mask are resampled
+        # it also works on a block of chromosomes (2d array)
+        mask = np.random.random(self.shape) < indep_prob
+        self[mask] = self.element_class.random(size=np.count_nonzero(mask))
 
 
 class VectorChromosome(NumpyArrayChromosome):
@@ -136,12 +151,10 @@ class VectorChromosome(NumpyArrayChromosome):
 class MatrixChromosome(NumpyArrayChromosome):
     
     @side_effect
-    def mutate(self, indep_prob=0.1):
-        r, c = self.shape
-        for i in range(r):
-            for j in range(c):
-                if random() < indep_prob:
-                    self[i, j] += gauss(0, 0.1)
+    def mutate(self, indep_prob=0.1, mu=0, sigma=0.1):
+        # the genes selected by a Bernoulli mask are perturbed by Gaussian noises
+        mask = np.random.random(self.shape) < indep_prob
+        self[mask] += np.random.normal(mu, sigma, size=np.count_nonzero(mask))
 
     def cross(self, other):
         r, c = self.shape
@@ -157,9 +170,8 @@ class NaturalChromosome(VectorChromosome):
 
     @side_effect
     def mutate(self, indep_prob=0.1):
-        for i in range(len(self)):
-            if random()< indep_prob:
-                self[i] = NaturalGene.random()
+        mask = np.random.random(self.shape) < indep_prob
+        self[mask] = NaturalGene.random(size=np.count_nonzero(mask))
 
     def dual(self):
         return self.__class__(self.element_class.ub - self)
@@ -190,14 +202,187 @@ class BinaryChromosome(NaturalChromosome):
 
     @side_effect
     def mutate(self, indep_prob=0.5):
-        for i in range(len(self)):
-            if random() < indep_prob:
-                self[i] ^= 1
+        self ^= np.random.random(self.shape) < indep_prob
 
     def dual(self):
         return self.__class__(1 ^ self)
 
 
+# the number of 1-bits of each byte
+_POPCOUNT = np.array([bin(k).count('1') for k in range(256)], dtype=np.uint8)
+
+
+def _positions(n, k):
+    # k distinct random positions in range(n), drawn without an array of length n if k <= n/2
+    if k > n // 2:
+        return np.setdiff1d(np.arange(n), _positions(n, n - k), assume_unique=True)
+    ks = np.unique(np.random.randint(n, size=k))
+    while ks.size < k:
+        ks = np.unique(np.concatenate((ks, np.random.randint(n, size=k - ks.size))))
+    return ks
+
+
+class PackedBinaryChromosome(BaseChromosome):
+    """Binary chromosome packed into bytes, 8 genes per byte
+
+    The genes are stored as the `uint8` words `words` (see `np.packbits`),
+    where the padding bits of the last word are always 0.
+    Mutation, crossover and `dual` are bitwise operations on the words.
+
+    The genes are unpacked lazily, when the chromosome is indexed, iterated,
+    or converted to an array (`np.asarray(chromosome)`),
+    so the fitness functions for `BinaryChromosome` also apply to it.
+    The unpacked genes are read-only; use `chromosome[k] = v` to change them.
+
+    Attributes:
+        words (array): the packed genes
+        n_bits (int): the number of genes
+    """
+
+    element_class = BinaryGene
+
+    def __init__(self, array=None, n_bits=None, packed=False):
+        """
+        Args:
+            array (array-like, optional): the genes (0/1), or the words if `packed=True`
+            n_bits (int, optional): the number of genes, if `packed=True`
+            packed (bool, optional): whether `array` is the words
+        """
+
+        if array is None:
+            array = []
+        if packed:
+            # copied, since the padding bits are cleared
+            self.words = np.array(array, dtype=np.uint8)
+            self.n_bits = 8 * len(self.words) if n_bits is None else n_bits
+            self.words[-1:] &= self._tail_mask()
+        else:
+            bits = np.asarray(array, dtype=np.uint8)
+            self.words = np.packbits(bits)
+            self.n_bits = len(bits)
+        self._bits = None
+
+    def _tail_mask(self):
+        # the mask of the valid bits of the last word
+        r = self.n_bits % 8
+        return np.uint8((0xFF << (8 - r)) & 0xFF) if r else np.uint8(0xFF)
+
+    def _changed(self):
+        self._bits = None
+
+    @classmethod
+    def random(cls, size=None):
+        size = size or cls.default_size
+        words = np.random.randint(256, size=(size + 7) // 8, dtype=np.uint8)
+        return cls(words, n_bits=size, packed=True)
+
+    @classmethod
+    def zero(cls):
+        return cls(np.zeros((cls.default_size + 7) // 8, dtype=np.uint8), n_bits=cls.default_size, packed=True)
+
+    @classmethod
+    def one(cls):
+        return cls(np.full((cls.default_size + 7) // 8, 0xFF, dtype=np.uint8), n_bits=cls.default_size, packed=True)
+
+    @property
+    def bits(self):
+        # the unpacked genes (read-only), computed once until the chromosome changes
+        if self._bits is None:
+            self._bits = np.unpackbits(self.words, count=self.n_bits)
+            self._bits.flags.writeable = False
+        return self._bits
+
+    def __array__(self, dtype=None, copy=None):
+        return self.bits if dtype is None else self.bits.astype(dtype)
+
+    def __len__(self):
+        return self.n_bits
+
+    def __iter__(self):
+        return iter(self.bits)
+
+    def __getitem__(self, k):
+        return self.bits[k]
+
+    @side_effect
+    def __setitem__(self, k, v):
+        bits = self.bits.copy()
+        bits[k] = v
+        self.words = np.packbits(bits)
+        self._changed()
+
+    def __str__(self):
+        return "".join(map(str, self.bits))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_bits'] = None
+        return state
+
+    @property
+    def nbytes(self):
+        return self.words.nbytes
+
+    def popcount(self):
+        # the number of 1s
+        return int(_POPCOUNT[self.words].sum())
+
+    def hamming(self, other):
+        # the Hamming distance to another chromosome
+        return int(_POPCOUNT[self.words ^ other.words].sum())
+
+    def equal_to(self, other):
+        if isinstance(other, PackedBinaryChromosome):
+            return self.n_bits == other.n_bits and np.array_equal(self.words, other.words)
+        return np.array_equal(self.bits, other)
+
+    def _mask(self, k):
+        # the mask of the first k bits
+        mask = np.zeros(len(self.words), dtype=np.uint8)
+        mask[:k // 8] = 0xFF
+        if k % 8:
+            mask[k // 8] = (0xFF << (8 - k % 8)) & 0xFF
+        return mask
+
+    def _child(self, words):
+        return self.__class__(words, n_bits=self.n_bits, packed=True)
+
+    def cross(self, other):
+        # one-point crossover
+        mask = self._mask(randint(1, len(self)-1))
+        return self._child((self.words & mask) | (other.words & ~mask))
+
+    def cross2(self, other):
+        # return 2 children after one-point crossover
+        mask = self._mask(randint(1, len(self)-1))
+        return (self._child((self.words & mask) | (other.words & ~mask)),
+            self._child((other.words & mask) | (self.words & ~mask)))
+
+    def uniform_cross(self, other):
+        # uniform crossover by a random mask
+        mask = np.random.randint(256, size=len(self.words), dtype=np.uint8)
+        return self._child((self.words & mask) | (other.words & ~mask))
+
+    @side_effect
+    def mutate(self, indep_prob=0.5):
+        # flip k ~ B(n_bits, indep_prob) genes at random positions, without a mask of all the genes
+        ks = _positions(self.n_bits, np.random.binomial(self.n_bits, indep_prob))
+        np.bitwise_xor.at(self.words, ks >> 3, (0x80 >> (ks & 7)).astype(np.uint8))
+        self._changed()
+
+    def dual(self):
+        words = ~self.words
+        words[-1:] &= self._tail_mask()
+        return self._child(words)
+
+    def copy(self, type_=None, *args, **kwargs):
+        type_ = type_ or self.__class__
+        return type_(self.words, n_bits=self.n_bits, packed=True)
+
+    def clone(self):
+        return self.copy()
+
+
 class PermutationChromosome(NaturalChromosome):
     # A chromosome representing a permutation
 
@@ -249,9 +434,8 @@ class FloatChromosome(NumpyArrayChromosome):
     @side_effect
     def mutate(self, indep_prob=0.1, mu=0, sigma=None):
         sigma = sigma or self.sigma
-        for i in range(len(self)):
-            if random() < indep_prob:
-                self[i] += gauss(mu, sigma)
+        mask = np.random.random(self.shape) < indep_prob
+        self[mask] += np.random.normal(mu, sigma, size=np.count_nonzero(mask))
 
     def random_neighbour(self, mu=0, sigma=None):
         # select a neighour randomly
@@ -417,7 +601,7 @@ class ArrayChromosome(BaseChromosome, array.array):
         if array is None:
             array = []
 
-        return array.array(element_class, array)
+        return super().__new__(cls, element_class, array)
 
     def cross(self, other):
         # note that when len(self) == 2  ==>  k==1
@@ -429,10 +613,11 @@ class ArrayChromosome(BaseChromosome, array.array):
 
     @side_effect
     def mutate(self, indep_prob=0.1):
-        a = self.random()
-        for k, ak in enumerate(a):
-            if random() < indep_prob:
-                self[k] = ak
+        # the genes selected by a Bernoulli mask are resampled in one batch
+        ks = np.flatnonzero(np.random.random(len(self)) < indep_prob)
+        if ks.size:
+            for k, v in zip(ks, _sample(self, ks)):
+                self[k] = v
 
 
 class ListChromosome(BaseChromosome, list):
@@ -454,7 +639,8 @@ class ListChromosome(BaseChromosome, list):
 
     @side_effect
     def mutate(self, indep_prob=0.1):
-        a = self.random()
-        for k, ak in enumerate(a):
-            if random() < indep_prob:
-                self[k] = ak
+        # the genes selected by a Bernoulli mask are resampled in one batch
+        ks = np.flatnonzero(np.random.random(len(self)) < indep_prob)
+        if ks.size:
+            for k, v in zip(ks, _sample(self, ks)):
+                self[k] = v
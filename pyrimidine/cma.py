@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+
+"""
+Covariance Matrix Adaptation Evolution Strategy (CMA-ES)
+
+In each generation, lambda candidates are sampled as one matrix from N(m, sigma^2 C),
+and the mean m, the step size sigma and the covariance matrix C are updated
+by the mu best candidates (weighted recombination, cumulative step-size adaptation,
+rank-one and rank-mu updates).
+The eigendecomposition of C is refreshed only every O(d) generations,
+so the cost is O(d^2) per generation amortized (besides the O(mu d^2) rank-mu update).
+
+The population (its elements) is the latest generation of the candidates;
+`max_fitness`, `best_element` and `solution` refer to the best candidate ever found.
+
+With `n_restarts > 0`, the algorithm restarts with a new random mean and
+a population `incpopsize` times larger, when the search stagnates (IPOP-CMA-ES).
+
+*References*
+Hansen, N. (2016). "The CMA Evolution Strategy: A Tutorial". arXiv:1604.00772.
+Auger, A., Hansen, N. (2005). "A Restart CMA Evolution Strategy With Increasing Population Size".
+  In IEEE Congress on Evolutionary Computation (pp. 1769-1776).
+"""
+
+import numpy as np
+
+from .base import BasePopulation
+from .mixin import evaluate_batch
+
+
+class CMAEvolutionStrategy(BasePopulation):
+    """CMA-ES
+
+    Each element is (or is encoded by) one chromosome of floats.
+    If the elements define the classmethod `_fitness_batch`,
+    the candidates are evaluated in one call.
+
+    Params:
+        lambda_: the number of the candidates, 4 + 3 ln(d) by default
+        mu: the number of the parents, lambda // 2 by default
+        sigma: the initial step size
+        n_restarts: the maximal number of the restarts (IPOP)
+        incpopsize: the factor of the increase of lambda in each restart
+        tolfun: stop (or restart) if the range of the fitness of a generation is less than it
+        tolx: stop (or restart) if the step size in each coordinate is less than it
+    """
+
+    default_size = 10
+
+    params = {
+        "lambda_": None,
+        "mu": None,
+        "sigma": 0.3,
+        "n_restarts": 0,
+        "incpopsize": 2,
+        "tolfun": 1e-12,
+        "tolx": 1e-12
+    }
+
+    mean = None
+    best_genome = None
+
+    # the state of the search saved in the checkpoints, besides the candidates
+    _search_state = ('mean', 'step_size', 'popsize', 'pc', 'ps', 'C', 'B', 'D', 'generation', '_eigen_generation',
+        'best_genome', 'best_fitness_value', 'n_evaluations', 'restarts', 'stopped')
+
+    def init(self):
+        super().init()
+        genomes = np.array([self._genome(e) for e in self], dtype=float)
+        # the initial elements are the first candidates
+        fitness = np.asarray(self.get_all_fitness(), dtype=float)
+        k = np.argmax(fitness)
+        self.best_genome = genomes[k]
+        self.best_fitness_value = fitness[k]
+        self.n_evaluations = len(fitness)
+        self.restarts = 0
+        self.stopped = False
+        self._start(genomes.mean(axis=0), self.lambda_ or 4 + int(3 * np.log(genomes.shape[1])))
+
+    def get_state(self):
+        # the distribution N(m, sigma^2 C), the evolution paths and the best candidate are saved
+        state = super().get_state()
+        if self.mean is not None:
+            state['search'] = {k: getattr(self, k) for k in self._search_state}
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        if 'search' in state:
+            search = state['search']
+            # the constants of the strategy, determined by the dimension, `popsize` and `mu`
+            self._start(search['mean'], search['popsize'])
+            for k, v in search.items():
+                setattr(self, k, v)
+
+    @staticmethod
+    def _genome(element):
+        return element if isinstance(element, np.ndarray) else element.chromosome
+
+    def _start(self, mean, popsize):
+        # (re)start the search from the mean, with `popsize` candidates in each generation
+        d = len(mean)
+        self.mean = mean
+        self.step_size = self.sigma
+        self.popsize = popsize
+        mu = min(self.mu or popsize // 2, popsize)
+        w = np.log(mu + 1 / 2) - np.log(np.arange(1, mu + 1))
+        self.weights = w / w.sum()
+        self.mueff = 1 / np.sum(self.weights ** 2)
+        mueff = self.mueff
+        self.cc = (4 + mueff / d) / (d + 4 + 2 * mueff / d)
+        self.cs = (mueff + 2) / (d + mueff + 5)
+        self.c1 = 2 / ((d + 1.3) ** 2 + mueff)
+        self.cmu = min(1 - self.c1, 2 * (mueff - 2 + 1 / mueff) / ((d + 2) ** 2 + mueff))
+        self.damps = 1 + 2 * max(0, np.sqrt((mueff - 1) / (d + 1)) - 1) + self.cs
+        self.chiN = np.sqrt(d) * (1 - 1 / (4 * d) + 1 / (21 * d ** 2))
+        self.pc = np.zeros(d)
+        self.ps = np.zeros(d)
+        self.C = np.eye(d)
+        self.B = np.eye(d)
+        self.D = np.ones(d)
+        self.generation = 0
+        self._eigen_generation = 0
+
+    def _update_eigen(self):
+        # refresh the eigendecomposition of C, every 1 / (c1 + cmu) / d / 10 generations
+        if (self.generation - self._eigen_generation) * (self.c1 + self.cmu) * len(self.mean) * 10 < 1:
+            return
+        self._eigen_generation = self.generation
+        self.C = np.triu(self.C) + np.triu(self.C, 1).T
+        D2, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(D2, 1e-20))
+
+    def sample(self, popsize=None):
+        """Sample the candidates
+
+        Returns:
+            tuple of arrays: the candidates X = m + sigma Y, and Y ~ N(0, C), of shape (lambda, d)
+        """
+
+        popsize = popsize or self.popsize
+        Z = np.random.standard_normal((popsize, len(self.mean)))
+        Y = (Z * self.D) @ self.B.T
+        return self.mean + self.step_size * Y, Y
+
+    def evaluate(self, genomes):
+        # the fitness of the genomes, by `_fitness_batch` if it is defined
+        if hasattr(self.element_class, '_fitness_batch'):
+            return evaluate_batch(self.element_class, genomes, genomes)
+        candidates = [self._from_genome(self[0], g) for g in genomes]
+        return np.asarray(self._get_fitness(candidates), dtype=float)
+
+    def transition(self, *args, **kwargs):
+        if self.mean is None:
+            self.init()
+        if self.stopped:
+            return
+        X, Y = self.sample()
+        fitness = self.evaluate(X)
+        self.n_evaluations += len(X)
+        self.elements = [self._from_genome(self[0], x) for x in X]
+        # the fitness of the candidates is known, so it is not evaluated again for the statistics
+        self.set_all_fitness(fitness)
+        for e, f in zip(self, fitness):
+            if hasattr(e, '_cache'):
+                e.set_cache(fitness=f)
+        k = np.argmax(fitness)
+        if fitness[k] > self.best_fitness_value:
+            self.best_fitness_value = fitness[k]
+            self.best_genome = X[k].copy()
+        self.update(Y, fitness)
+        if self.stagnates(fitness):
+            if self.restarts < self.n_restarts:
+                self.restarts += 1
+                mean = np.asarray(self._genome(self.element_class.random()), dtype=float)
+                self._start(mean, self.popsize * self.incpopsize)
+            else:
+                self.stopped = True
+
+    def update(self, Y, fitness):
+        """Update the mean, the evolution paths, C and sigma
+
+        Args:
+            Y (array): the steps of the candidates, sampled from N(0, C)
+            fitness (array): the fitness of the candidates
+        """
+
+        mu = len(self.weights)
+        n = len(fitness)
+        ks = np.argpartition(fitness, n - mu)[n - mu:]
+        ks = ks[np.argsort(-fitness[ks])]
+        Ysel = Y[ks]
+        y_w = self.weights @ Ysel
+        self.mean = self.mean + self.step_size * y_w
+        self.generation += 1
+
+        cs, cc, c1, cmu, mueff = self.cs, self.cc, self.c1, self.cmu, self.mueff
+        # C^(-1/2) y_w
+        z_w = self.B @ ((self.B.T @ y_w) / self.D)
+        self.ps = (1 - cs) * self.ps + np.sqrt(cs * (2 - cs) * mueff) * z_w
+        norm_ps = np.linalg.norm(self.ps)
+        hsig = norm_ps / np.sqrt(1 - (1 - cs) ** (2 * self.generation)) / self.chiN < 1.4 + 2 / (len(self.mean) + 1)
+        self.pc = (1 - cc) * self.pc + hsig * np.sqrt(cc * (2 - cc) * mueff) * y_w
+        self.C *= 1 - c1 - cmu + (1 - hsig) * c1 * cc * (2 - cc)
+        self.C += c1 * np.outer(self.pc, self.pc)
+        self.C += cmu * (Ysel.T * self.weights) @ Ysel
+        self.step_size *= np.exp(min(1, (cs / self.damps) * (norm_ps / self.chiN - 1)))
+        self._update_eigen()
+
+    def stagnates(self, fitness):
+        # the termination criteria: tolfun, tolx, and the condition number of C
+        return (np.ptp(fitness) < self.tolfun
+            or self.step_size * np.sqrt(np.max(np.diag(self.C))) < self.tolx
+            or np.max(self.D) > 1e7 * np.min(self.D))
+
+    @property
+    def max_fitness(self):
+        if self.best_genome is None:
+            return super().max_fitness
+        return self.best_fitness_value
+
+    @property
+    def best_element(self):
+        if self.best_genome is None:
+            return super().best_element
+        return self._from_genome(self[0], self.best_genome.copy())
@@ -2,49 +2,182 @@
 
 """
 Differential Evolution Algorithm
+
+The genomes of the population and the trial vectors are stored in two matrices,
+where the (chromosomes of the) elements are the views of the rows;
+all mutant vectors and crossover masks are generated in one batch.
+
+Strategies (see `mutants`):
+    rand/1: v = x_r0 + F (x_r1 - x_r2)
+    best/1: v = x_best + F (x_r0 - x_r1)
+    current-to-best/1: v = x + F (x_best - x) + F (x_r0 - x_r1)
+    rand/2: v = x_r0 + F (x_r1 - x_r2) + F (x_r3 - x_r4)
 """
 
 
 import numpy as np
 
 from .base import BaseIndividual
-from .mixin import PopulationMixin
+from .mixin import PopulationMixin, evaluate_batch, are_row_views
 from .meta import MetaContainer
-from .individual import MonoIndividual
-
-from .utils import *
+from .deco import side_effect
+
+
+# the number of the random vectors used by each strategy
+_strategies = {'rand/1': 3, 'best/1': 2, 'current-to-best/1': 2, 'rand/2': 5}
+
+
+def _distinct(n, k):
+    # k distinct indices in range(n) for each row i, different from i
+    r = np.random.randint(n - 1, size=(n, k))
+    r += r >= np.arange(n)[:, None]
+    for j in range(1, k):
+        while True:
+            bad = np.flatnonzero(np.any(r[:, :j] == r[:, j:j+1], axis=1))
+            if bad.size == 0:
+                break
+            s = np.random.randint(n - 1, size=bad.size)
+            r[bad, j] = s + (s >= bad)
+    return r
+
+
+def mutants(genomes, strategy='rand/1', factor=0.5, best=None):
+    """The mutant vectors of DE
+
+    Args:
+        genomes (array): the genomes, of shape (n, d)
+        strategy (str, optional): 'rand/1', 'best/1', 'current-to-best/1' or 'rand/2'
+        factor (float | array, optional): the scaling factor F,
+            or an array broadcastable to (n, d), e.g. dithered factors of shape (n, 1)
+        best (int, optional): the index of the best genome (for 'best/1' and 'current-to-best/1')
+
+    Returns:
+        array: the mutant vectors, of shape (n, d)
+    """
+
+    if strategy not in _strategies:
+        raise ValueError(f'Unknown strategy `{strategy}`!')
+    n = len(genomes)
+    k = _strategies[strategy]
+    if n <= k:
+        raise ValueError(f'The strategy `{strategy}` needs more than {k} individuals!')
+    r = _distinct(n, k)
+    X = genomes
+    if strategy == 'rand/1':
+        return X[r[:, 0]] + factor * (X[r[:, 1]] - X[r[:, 2]])
+    elif strategy == 'best/1':
+        return X[best] + factor * (X[r[:, 0]] - X[r[:, 1]])
+    elif strategy == 'current-to-best/1':
+        return X + factor * (X[best] - X) + factor * (X[r[:, 0]] - X[r[:, 1]])
+    else:
+        return X[r[:, 0]] + factor * (X[r[:, 1]] - X[r[:, 2]] + X[r[:, 3]] - X[r[:, 4]])
 
 
 class DifferentialEvolution(PopulationMixin, metaclass=MetaContainer):
-    # Differential Evolution Algo.
-    
+    """Differential Evolution Algo.
+
+    The chromosomes of the elements should be 1-d arrays of floats.
+    The matrices `genomes` and `trials` are built in `init`;
+    the population keeps the vector `fitness_values` of its elements,
+    which is returned by `get_all_fitness`.
+    If the elements define the classmethod `_fitness_batch`,
+    the trials are evaluated in one call.
+
+    Params:
+        factor: the scaling factor F
+        cross_prob: the probability of the binomial crossover
+        strategy: the strategy of the mutation, 'rand/1' by default
+        dither: (low, high), to draw F ~ U(low, high) for each individual in each generation
+        jitter: the relative noise of F for each gene
+    """
+
     element_class = BaseIndividual
     default_size = 4
 
     params ={
         "factor" : 0.05,
         "cross_prob": 0.75,
+        "strategy": 'rand/1',
+        "dither": None,
+        "jitter": 0
     }
 
-    def init(self):
-        self.ndims = tuple(map(len, self[0]))
+    genomes = None
 
+    def init(self):
+        self.ndims = tuple(map(len, self._parts(self[0])))
+        self._stack()
+
+    @staticmethod
+    def _parts(element):
+        # the chromosomes of an element
+        return [element] if isinstance(element, np.ndarray) else list(element)
+
+    def _bind(self, elements, genomes):
+        # let the chromosomes of the elements be the views of the rows of the genomes
+        bounds = np.cumsum((0,) + self.ndims)
+        if isinstance(elements[0], np.ndarray):
+            return [g.view(e.__class__) for e, g in zip(elements, genomes)]
+        for e, g in zip(elements, genomes):
+            for k, (c, a, b) in enumerate(zip(e, bounds[:-1], bounds[1:])):
+                e[k] = g[a:b].view(c.__class__)
+        return elements
+
+    def _stack(self):
+        # build the matrices of the genomes and the trials
+        self.genomes = np.array([np.concatenate(self._parts(e)) for e in self], dtype=float)
+        self.trials = self.genomes.copy()
+        self.test = self.copy()
+        self.elements = self._bind(self.elements, self.genomes)
+        self.test.elements = self._bind(self.test.elements, self.trials)
+        self.fitness_values = np.asarray(super().get_all_fitness(), dtype=float)
+
+    def _is_stacked(self):
+        return are_row_views((self._parts(e)[0] for e in self), self.genomes)
+
+    def get_all_fitness(self):
+        # the fitness vector held by the population, once the genomes are stacked
+        if self._is_stacked():
+            return self.fitness_values
+        return super().get_all_fitness()
+
+    def evaluate(self):
+        # the fitness of the trials
+        if hasattr(self.element_class, '_fitness_batch'):
+            genomes = self.trials if len(self.ndims) == 1 else None
+            return evaluate_batch(self.element_class, self.test.elements, genomes)
+        return np.array([t._evaluate() for t in self.test], dtype=float)
+
+    @side_effect
     def transition(self, *args, **kwargs):
+        if not self._is_stacked():
+            self.init()
         self.move()
-        for k, (test_individual, individual) in enumerate(zip(self.test, self)):
-            if test_individual.fitness > individual.fitness:
-                self[k] = test_individual
+        fitness = self.evaluate()
+        # greedy replacement
+        ks = np.flatnonzero(fitness > self.fitness_values)
+        self.genomes[ks] = self.trials[ks]
+        self.fitness_values[ks] = fitness[ks]
+        for k in ks:
+            e = self[k]
+            if hasattr(e, '_cache'):
+                e.clear_cache()
+                e.set_cache(fitness=fitness[k])
 
     def move(self):
-        self.test = self.copy()
-        for t in self.test:
-            x0, x1, x2 = choice(self, size=3, replace=False)
-            jrand = map(np.random.randint, self.ndims)
-            xx = x0 + self.factor * (x1 - x2)
-            for chromosome, xc, n, r in zip(t, xx, self.ndims, jrand):
-                ind = np.random.random(n) < self.cross_prob
-                chromosome[ind] = xc[ind]
-                chromosome[r] = xc[r]
+        # generate the trials by mutation and binomial crossover
+        X = self.genomes
+        n, d = X.shape
+        factor = self.factor
+        if self.dither is not None:
+            factor = np.random.uniform(*self.dither, size=(n, 1))
+        if self.jitter:
+            factor = factor * (1 + self.jitter * (np.random.random((n, d)) - 0.5))
+        V = mutants(X, self.strategy, factor, best=np.argmax(self.fitness_values))
+        mask = np.random.random((n, d)) < self.cross_prob
+        mask[np.arange(n), np.random.randint(d, size=n)] = True
+        np.copyto(self.trials, X)
+        np.copyto(self.trials, V, where=mask)
 
 
 class DifferentialEvolutionC(DifferentialEvolution):
@@ -56,15 +189,5 @@ class DifferentialEvolutionC(DifferentialEvolution):
     }
 
     def init(self):
+        super().init()
         self.ndim = len(self[0])
-
-    def move(self):
-        self.test = self.copy()
-        for t in self.test:
-            x0, x1, x2 = choice(self, size=3, replace=False)
-            xx = x0 + self.factor * (x1 - x2)
-            jrand = np.random.randint(self.ndim)
-            ind = np.random.random(n) < self.cross_prob
-            t[ind] = xx[ind]
-            t[jrand] = xx[jrand]
-
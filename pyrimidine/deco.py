@@ -6,12 +6,31 @@ Decorators
 
 from types import MethodType
 from operator import methodcaller
+from collections import OrderedDict
 import copy
+import hashlib
+
+import numpy as np
+
+
+def touch(obj):
+    """Mark the object as changed
+
+    Each object counts its changes in `_stamp`, so the populations know
+    whether the fitness vector cached for their elements is out of date
+    (see `PopulationMixin.get_all_fitness`).
+    """
+
+    try:
+        obj._stamp = getattr(obj, '_stamp', 0) + 1
+    except AttributeError:
+        pass
 
 
 def clear_cache(func):
     def mthd(obj, *args, **kwargs):
         result = func(obj, *args, **kwargs)
+        touch(obj)
         obj.clear_cache()
         return result
     return mthd
@@ -32,8 +51,9 @@ def side_effect(func):
 
     def mthd(obj, *args, **kwargs):
         result = func(obj, *args, **kwargs)
-        # clear the cache after calling the method
-        if hasattr(obj, '_cache'):
+        touch(obj)
+        # clear the cache (or the fitness vector of a population) after calling the method
+        if hasattr(obj, '_cache') or hasattr(obj, '_fitness_vector'):
             obj.clear_cache()
         return result
     return mthd
@@ -42,6 +62,7 @@ def side_effect(func):
 def clear_fitness(func):
     def mthd(obj, *args, **kwargs):
         result = func(obj, *args, **kwargs)
+        touch(obj)
         obj.clear_cache('fitness')
         return result
     return mthd
@@ -177,6 +198,125 @@ class add_cache:
 fitness_cache = add_cache(('fitness',))
 
 
+class FitnessMemo:
+    """LRU memo of fitness, keyed by the hash of the genome
+
+    Unlike `_cache`, that only records the last fitness of an object,
+    it records the fitness of the genomes evaluated by a class,
+    so the offspring equal to an evaluated genome is not evaluated again.
+
+    Attributes:
+        maxsize (int): the maximum number of records
+        hits (int): the number of the lookups found in the memo
+        misses (int): the number of the lookups not found in the memo
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    @staticmethod
+    def key(obj):
+        """The key of an object: the digest of the bytes of its chromosomes
+
+        `obj` is a chromosome (array) or an individual (a sequence of chromosomes)
+        """
+
+        h = hashlib.blake2b(digest_size=16)
+        for a in ((obj,) if isinstance(obj, np.ndarray) else obj):
+            a = np.ascontiguousarray(a)
+            h.update(np.asarray(a.shape).tobytes())
+            h.update(a.tobytes())
+        return h.digest()
+
+    def get(self, key, default=None):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        else:
+            self.misses += 1
+            return default
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self):
+        n = self.hits + self.misses
+        return self.hits / n if n else 0
+
+    def __repr__(self):
+        return f'FitnessMemo(hits={self.hits}, misses={self.misses}, size={len(self)}, maxsize={self.maxsize})'
+
+
+class _ClassFitnessMemo:
+    # the descriptor giving each class its own fitness memo, created in `__dict__` of the class on first access
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+
+    def __get__(self, obj, owner):
+        memo = owner.__dict__.get('_class_fitness_memo')
+        if memo is None:
+            memo = FitnessMemo(maxsize=self.maxsize)
+            setattr(owner, '_class_fitness_memo', memo)
+        return memo
+
+
+def clear_fitness_memo(cls):
+    """Clear the fitness memos of the class and its subclasses
+
+    It is called when the fitness function of the class is replaced, e.g. by `set_fitness`.
+    """
+
+    classes = [cls]
+    while classes:
+        c = classes.pop()
+        memo = c.__dict__.get('_class_fitness_memo')
+        if memo is not None:
+            memo.clear()
+        classes.extend(c.__subclasses__())
+
+
+class memoize_fitness:
+    """Add a class-level LRU memo of fitness to the class
+
+    The fitness is looked up in the memo by the genome, before calling `_fitness`.
+    Each subclass has its own memo, since it may override `_fitness`.
+
+    Example:
+        @memoize_fitness(maxsize=10000)
+        class MyIndividual(MonoIndividual):
+            ...
+
+        pop.evolve()
+        print(pop.fitness_memo.hits)
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+
+    def __call__(self, cls):
+        cls._fitness_memo = _ClassFitnessMemo(maxsize=self.maxsize)
+        return cls
+
+
 class set_fitness:
 
     def __init__(self, f=None):
@@ -190,6 +330,7 @@ class set_fitness:
                 raise Exception("""Function `_fitness` is not defined before setting fitness.
 You may forget to create the class in the context of environment.""")
         cls._fitness = self.f
+        clear_fitness_memo(cls)
         return cls
 
 
@@ -220,6 +361,7 @@ class add_memory:
 
         def _set_memory(obj, **d):
             obj._memory.update(d)
+            touch(obj)
 
         cls.set_memory = _set_memory
 
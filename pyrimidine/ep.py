@@ -17,16 +17,17 @@ The mutation:
     x' <- x + r*sqrt(v)
     v' <- v + c*r*sqrt(v) (make sure that v>epsilon)
 
+The selection (q-tournament):
+    each individual of the 2N mixed population meets q random opponents,
+    and the N individuals with the most wins survive
+
 Caution: No cross operation in EP
 """
 
-from random import choice
-from toolz.itertoolz import groupby
-from operator import attrgetter
-
 import numpy as np
 
 from .base import PopulationMixin, BaseChromosome
+from .mixin import are_row_views
 from .chromosome import FloatChromosome
 from .individual import MixedIndividual
 
@@ -64,8 +65,41 @@ class BaseEPIndividual(MixedIndividual):
         self.variance = np.maximum(self.variance, self.epsilon)
 
 
+def q_tournament(fitness, n_sel, q=10):
+    """The stochastic q-tournament selection of EP
+
+    Each individual meets `q` opponents chosen randomly,
+    and wins if its fitness is not less than the fitness of the opponent.
+
+    Args:
+        fitness (array): the fitness of the individuals
+        n_sel (int): the number of the selected individuals
+        q (int, optional): the number of the opponents
+
+    Returns:
+        array: the indices of the `n_sel` individuals with the most wins
+    """
+
+    fitness = np.asarray(fitness)
+    n = len(fitness)
+    n_sel = min(n_sel, n)
+    opponents = np.random.randint(n, size=(n, q))
+    wins = np.sum(fitness[:, None] >= fitness[opponents], axis=1)
+    return np.argpartition(wins, n - n_sel)[n - n_sel:]
+
+
 class EvolutionProgramming(PopulationMixin):
     """Evolution Programming
+
+    The solutions and the variances of the individuals are stored in the matrices
+    `genomes` and `variances`, where the chromosomes of the individuals are the views of the rows;
+    the offspring are produced by the Gaussian mutation of the matrices at once,
+    and the selection keeps the matrices in sync with the individuals.
+    If the solutions are not `FloatChromosome` or the individuals override `mutate`,
+    then the offspring are the copies of the individuals mutated by their own method `mutate`.
+
+    The fitness vector `fitness_values` is the cached fitness vector of the population (see `get_all_fitness`),
+    so it is recomputed after the individuals are changed by the methods with `side_effect`, e.g. `mutate`.
     
     Extends:
         PopulationMixin
@@ -73,26 +107,90 @@ class EvolutionProgramming(PopulationMixin):
     
     element_class = BaseEPIndividual
 
-    def select(self):
-        self.sort()
-        d = groupby(attrgetter('fitness'), self)
-        inds = []
-        ks = np.sort(list(d.keys()))[::-1]
-        flag = True
-        while flag:
-            for k in ks:
-                if d[k]:
-                    a = choice(d[k])
-                    inds.append(a)
-                    d[k].remove(a)
-                    if len(inds) <= self.default_size:
-                        flag = False
-                        break
-        self.individuals = inds
+    params = {'q': 10}
+
+    genomes = None
+
+    def init(self):
+        super().init()
+        if self._vectorized():
+            self._stack()
+
+    def _vectorized(self):
+        # the matrices apply to the solutions of floats with the standard mutation
+        e = self[0]
+        return isinstance(e.chromosomes[0], FloatChromosome) and type(e).mutate is BaseEPIndividual.mutate
+
+    def _individual(self, x, v):
+        # create an individual with the solution x and the variance v
+        e = self[0]
+        return e.__class__([e.chromosomes[0].__class__(x), e.variance.__class__(v)])
+
+    def _bind(self, fitness):
+        # let the individuals be the views of the rows of the matrices, with the known fitness
+        self.individuals = [self._individual(x, v) for x, v in zip(self.genomes, self.variances)]
+        self.set_all_fitness(fitness)
+        for e, f in zip(self, fitness):
+            if hasattr(e, '_cache'):
+                e.set_cache(fitness=f)
+
+    def _stack(self):
+        # build the matrices, and let the chromosomes of the individuals be the views of the rows
+        fitness = self.get_all_fitness()
+        self.genomes = np.array([e.chromosomes[0] for e in self], dtype=float)
+        self.variances = np.array([e.variance for e in self], dtype=float)
+        self._bind(fitness)
+
+    def _take(self, ks, fitness):
+        # keep the rows `ks` of the matrices, where `fitness` is the fitness of the rows
+        self.genomes, self.variances = self.genomes[ks], self.variances[ks]
+        self._bind(fitness[ks])
+
+    def _is_stacked(self):
+        return are_row_views((e.chromosomes[0] for e in self), self.genomes)
+
+    @property
+    def fitness_values(self):
+        return self.get_all_fitness()
+
+    def reproduce(self):
+        """Mutate the individuals at once
+
+        Returns:
+            tuple of arrays: the solutions and the variances of the offspring
+        """
+
+        c, epsilon = self[0].c, self[0].epsilon
+        S = np.sqrt(self.variances)
+        X = self.genomes + np.random.standard_normal(S.shape) * S
+        V = self.variances + c * np.random.standard_normal(S.shape) * S
+        np.maximum(V, epsilon, out=V)
+        return X, V
+
+    def select(self, n_sel=None):
+        # q-tournament selection
+        fitness = self.get_all_fitness()
+        ks = q_tournament(fitness, n_sel or self.default_size, self.q)
+        if self._vectorized() and self._is_stacked():
+            self._take(ks, fitness)
+        else:
+            self.individuals = [self[k] for k in ks]
 
     def transition(self, *args, **kwargs):
-        cpy = self.clone()
-        self.mutate()
-        self.merge(cpy)
-        self.select()
-    
+        if not self._vectorized():
+            offspring = [e.copy() for e in self]
+            for e in offspring:
+                e.mutate()
+            self.individuals = [*self, *offspring]
+            self.select()
+            return
+        if not self._is_stacked():
+            self._stack()
+        X, V = self.reproduce()
+        offspring = [self._individual(x, v) for x, v in zip(X, V)]
+
+        # select from the mixed population
+        fitness = np.concatenate((self.get_all_fitness(), self._get_fitness(offspring)))
+        self.genomes = np.concatenate((self.genomes, X))
+        self.variances = np.concatenate((self.variances, V))
+        self._take(q_tournament(fitness, self.default_size, self.q), fitness)
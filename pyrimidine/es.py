@@ -3,44 +3,147 @@
 """
 (mu + lambda) - Evolution Strategy
 
+The parents are stored in the matrix `genomes` with the vector of step sizes `sigmas`;
+the lambda offspring are produced as one array by recombination and the log-normal self-adaptation:
+    sigma' = sigma exp(tau N(0, 1)), x' = x + sigma' N(0, I),
+and the mu survivors are chosen by `argpartition`,
+from the parents and the offspring (plus selection) or from the offspring only (comma selection).
+
 *References*
 Rechenberg, I. 1973. Evolutionsstrategie – Optimierung technischer Systeme nach Prinzipien der biologischen Evolution, Frommann-Holzboog.
+Beyer, H.-G., Schwefel, H.-P. 2002. Evolution strategies – A comprehensive introduction. Natural Computing, 1, 3-52.
 """
 
+import numpy as np
 
 from .base import BasePopulation
-from .utils import randint2
+from .mixin import evaluate_batch, stack_rows, are_row_views
+from . import operators
 
 
 class EvolutionStrategy(BasePopulation):
-    # Evolution Strategy
+    """Evolution Strategy
+
+    Each element is (or is encoded by) one chromosome of floats.
+
+    Params:
+        mu: the number of the parents
+        lambda_: the number of the offspring
+        mode: 'plus' for (mu + lambda)-ES, or 'comma' for (mu, lambda)-ES
+        sigma: the initial step size
+        tau: the learning rate of the step sizes, 1/sqrt(d) by default
+        crossover: the recombination of the parents, see `operators.crossover`
+    """
 
     params ={
         "mu" : 10,
         "lambda_": 20,
+        "mode": 'plus',
+        "sigma": 0.1,
+        "tau": None,
+        "crossover": 'uniform'
     }
 
+    genomes = None
+
     def init(self):
         super().init()
-        if 'mu' not in self.params:
-            self.set_params(mu=self.default_size) 
+        self._stack()
+
+    @staticmethod
+    def _genome(element):
+        return element if isinstance(element, np.ndarray) else element.chromosome
+
+    def _stack(self, sigmas=None):
+        # build the matrix of the genomes, and let the elements be the views of its rows
+        fitness = self.get_all_fitness()
+        self.genomes, genomes = stack_rows(self._genome(e) for e in self)
+        if sigmas is None:
+            self.sigmas = np.full(len(self), self.sigma, dtype=float)
+        else:
+            self.sigmas = np.array(sigmas, dtype=float)
+        self.elements = [self._from_genome(e, g) for e, g in zip(self, genomes)]
+        self.set_all_fitness(fitness)
+
+    def _is_stacked(self):
+        return are_row_views((self._genome(e) for e in self), self.genomes)
+
+    @property
+    def fitness_values(self):
+        # the fitness vector of the elements, cached in the transition
+        return self.get_all_fitness()
+
+    def get_state(self):
+        # the step sizes are saved with the genomes
+        state = super().get_state()
+        if self._is_stacked():
+            state['sigmas'] = self.sigmas
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        if 'sigmas' in state:
+            self._stack(state['sigmas'])
+
+    def reproduce(self, lambda_=None):
+        """Produce the offspring
+
+        Returns:
+            tuple of arrays: the genomes (lambda, d) and the step sizes (lambda,) of the offspring
+        """
+
+        lambda_ = lambda_ or self.lambda_
+        X = self.genomes
+        n, d = X.shape
+        i = np.random.randint(n, size=lambda_)
+        j = (i + np.random.randint(1, n, size=lambda_)) % n if n > 1 else i
+        pairs = np.column_stack((i, j))
+        Y = operators.crossover(X, pairs, self.crossover)
+        sigmas = np.sqrt(self.sigmas[i] * self.sigmas[j])
+        tau = self.tau or 1 / np.sqrt(d)
+        sigmas *= np.exp(tau * np.random.standard_normal(lambda_))
+        Y += sigmas[:, None] * np.random.standard_normal(Y.shape)
+        return Y, sigmas
+
+    def evaluate(self, genomes):
+        # the fitness of the genomes, by `_fitness_batch` if it is defined
+        if hasattr(self.element_class, '_fitness_batch'):
+            return evaluate_batch(self.element_class, genomes, genomes)
+        offspring = [self._from_genome(self[0], g) for g in genomes]
+        return np.asarray(self._get_fitness(offspring), dtype=float)
 
     def transition(self, *args, **kwargs):
-        offspring = self.mate()
-        self.extend(offspring)
-        self.mate()
-        self.select_best_individuals(self.mu)
+        if not self._is_stacked():
+            self._stack()
+        Y, sigmas = self.reproduce()
+        fitness = self.evaluate(Y)
+        if self.mode == 'plus':
+            Y = np.concatenate((self.genomes, Y))
+            sigmas = np.concatenate((self.sigmas, sigmas))
+            fitness = np.concatenate((self.get_all_fitness(), fitness))
+        elif self.mode != 'comma':
+            raise ValueError(f'Unknown mode `{self.mode}`!')
+        n, mu = len(fitness), min(self.mu, len(fitness))
+        ks = np.argpartition(fitness, n - mu)[n - mu:]
+        self.genomes = Y[ks]
+        self.sigmas = sigmas[ks]
+        self.elements = [self._from_genome(self[0], g) for g in self.genomes]
+        # the fitness of the survivors is known, so it is not evaluated again for the statistics
+        self.set_all_fitness(fitness[ks])
+        for e, f in zip(self, fitness[ks]):
+            if hasattr(e, '_cache'):
+                e.set_cache(fitness=f)
 
     def mate(self, lambda_=None):
-        lambda_ = lambda_ or self.lambda_
-        offspring = []
-        n = len(self)
-        for _ in range(lambda_):
-            i, j = randint2(0, n-1)
-            child = self[i].cross(self[j])
-            offspring.append(child)
-        return offspring
+        # the offspring as the elements
+        if not self._is_stacked():
+            self._stack()
+        Y, _ = self.reproduce(lambda_)
+        return [self._from_genome(self[0], g) for g in Y]
 
     def select_best_individuals(self, mu=None):
-        mu = mu or self.mu
-        self.individuals = self.get_best_individuals(mu)
+        fitness = self.get_all_fitness()
+        n = len(fitness)
+        mu = min(mu or self.mu, n)
+        ks = np.argpartition(fitness, n - mu)[n - mu:]
+        self.individuals = [self[k] for k in ks]
@@ -8,13 +8,12 @@ Yang, X. S. (2010). "Firefly Algorithm: A New Approach for Optimization".
 Yang, X. S. (2013). "Nature-Inspired Metaheuristic Algorithms". Luniver Press.
 """
 
-from random import gauss, random
-from scipy.spatial.distance import pdist, squareform
 import numpy as np
 
-from .base import PopulationMixin
+from .mixin import PopulationMixin, evaluate_batch, stack_rows, are_row_views
 from .chromosome import FloatChromosome
-from .individual import PolyIndividual
+from .meta import MetaContainer
+from .deco import basic_memory, side_effect
 
 from .pso import BaseParticle
 
@@ -34,34 +33,132 @@ class BaseFirefly(BaseParticle):
         raise NotImplementedError
 
 
+class Firefly(BaseFirefly):
+    """Standard firefly, represented by its position
+    """
+
+    element_class = FloatChromosome
+    default_size = 1
+
+    params = {'alpha': 0.2}
+
+    @property
+    def position(self):
+        return self.chromosomes[0]
+
+    @position.setter
+    def position(self, x):
+        self.chromosomes[0] = x
+        self.after_setter()
+
+    def random_move(self):
+        self.position += self.alpha * (np.random.random(self.position.shape) - 0.5)
+
+
 def attractiveness(distance, gamma=1.0):
     return np.exp(-gamma * distance**2)
 
 
-class StandardFireflies:
+def compute_moves(positions, brightness, beta=1, gamma=1, max_memory=2**26):
+    """The moves of the fireflies towards the brighter ones
+
+    dx_i = sum_j [f_j > f_i] beta exp(-gamma r_ij^2) (x_j - x_i)
+
+    The differences x_j - x_i are computed exactly in blocks of rows,
+    where the size of the temporary arrays is bounded by `max_memory` (in bytes).
+
+    Args:
+        positions (array): the positions of the fireflies, of shape (n, d)
+        brightness (array): the brightness (fitness) of the fireflies
+        beta (float, optional): the attractiveness at distance 0
+        gamma (float, optional): the light absorption coefficient
+        max_memory (int, optional): the upper bound of the temporary memory
+
+    Returns:
+        array: the moves, of shape (n, d)
+    """
+
+    X = np.asarray(positions, dtype=float)
+    f = np.asarray(brightness, dtype=float)
+    n, d = X.shape
+    # the temporary arrays of shape (block, n, d) and about 2 of shape (block, n)
+    block = max(1, max_memory // (8 * n * (d + 2)))
+    M = np.empty_like(X)
+    for start in range(0, n, block):
+        Xb = X[start:start+block]
+        D = X - Xb[:, None, :]
+        W = np.exp(-gamma * np.einsum('ijk,ijk->ij', D, D))
+        W *= beta
+        W[f[start:start+block, None] >= f] = 0
+        M[start:start+block] = np.einsum('ij,ijk->ik', W, D)
+    return M
+
+
+class StandardFireflies(PopulationMixin, metaclass=MetaContainer):
     """Starndard Firefly Algorithm
+
+    The positions of the fireflies are stacked into the matrix `positions` (of shape (n, d)),
+    and the fireflies hold the views of its rows.
+    In each step, all fireflies move towards the brighter ones at once (see `compute_moves`),
+    and then walk randomly.
     """
 
-    element_class = BaseFirefly
+    element_class = Firefly
+    default_size = 20
 
     params = {
         "gamma": 1,
         "beta": 1,
-        "alpha": 0.2
+        "alpha": 0.2,
+        "max_memory": 2**26
     }
-    
-    def transition(self, *args, **kwargs):
 
-        distances = squareform(pdist([f.position for f in self]))
-        att = attractiveness(distances)
+    alias = {
+    'fireflies': 'elements',
+    'n_fireflies': 'n_elements'
+    }
 
-        for i, fi in enumerate(self[:-1]):
-            for j, fj in enumerate(self[i+1:]):
-                if fj.fitness > fi.fitness:
-                    fi.move(self.alpha * att[i, j] * (fj.position - fi.position))
+    positions = None
 
-        for f in self:
-            f.random_move()
+    def init(self):
+        super().init()
+        self._stack()
 
-        for f in self:
-            f.backup()
+    def _stack(self):
+        # stack the positions, and let the fireflies hold the views of the rows
+        self.positions, xs = stack_rows(f.position for f in self)
+        for f, x in zip(self, xs):
+            f.chromosomes[0] = x
+        self.brightness = self.evaluate()
+        self.best_fitness_values = np.array([f.fitness for f in self], dtype=float)
+
+    def _is_stacked(self):
+        return are_row_views((f.position for f in self), self.positions)
+
+    def _get_fitness(self, elements):
+        # the fitness of a firefly is the fitness of its best position
+        return [f.fitness for f in elements]
+
+    def evaluate(self):
+        # the fitness of the current positions of the fireflies
+        if hasattr(self.element_class, '_fitness_batch'):
+            return evaluate_batch(self.element_class, self.positions, self.positions)
+        return np.array([f._evaluate() for f in self], dtype=float)
+
+    def transition(self, *args, **kwargs):
+        if not self._is_stacked():
+            self._stack()
+        X = self.positions
+        X += compute_moves(X, self.brightness, self.beta, self.gamma, self.max_memory)
+        X += self.alpha * (np.random.random(X.shape) - 0.5)
+        self.backup()
+
+    @side_effect
+    def backup(self):
+        # update the brightness, and the memory of the fireflies moving to better positions
+        self.brightness = self.evaluate()
+        ks = np.flatnonzero(self.brightness > self.best_fitness_values)
+        self.best_fitness_values[ks] = self.brightness[ks]
+        for k in ks:
+            f = self[k]
+            f.set_memory(fitness=self.brightness[k], solution=f.position.copy())
@@ -10,7 +10,6 @@ It was introduced as a nature-inspired algorithm for solving optimization proble
 3. Niazi, M., Mirjalili, S., Mirjalili, S. M., & Yang, X. S. (2016). "Enhanced Gravity Search Algorithm". Swarm and Evolutionary Computation, 6(1), 10-21.
 """
 
-from scipy.spatial.distance import pdist, squareform
 from .base import PopulationMixin
 from .chromosome import FloatChromosome
 from .pso import BaseParticle
@@ -20,6 +19,54 @@ from .deco import side_effect
 import numpy as np
 
 
+def compute_accelerations(positions, masses, gravity_coefficient=1, n_best=None, max_memory=2**26, epsilon=1e-12):
+    """The accelerations of the particles caused by the gravity
+
+    a_i = sum_j G r_ij m_j (x_j - x_i) / R_ij^3, where r_ij ~ U(0, 1),
+    and j runs over the `n_best` heaviest particles (Kbest GSA), or all particles by default.
+
+    The differences x_j - x_i are computed exactly in blocks of rows,
+    where the size of the temporary arrays is bounded by `max_memory` (in bytes),
+    so the cost is O(n k d) without the (n, n, d) array of the differences.
+
+    Args:
+        positions (array): the positions of the particles, of shape (n, d)
+        masses (array): the masses of the particles
+        gravity_coefficient (float, optional): G
+        n_best (int, optional): the number of the attractors
+        max_memory (int, optional): the upper bound of the temporary memory
+        epsilon (float, optional): to avoid division by zero
+
+    Returns:
+        array: the accelerations, of shape (n, d)
+    """
+
+    X = np.asarray(positions, dtype=float)
+    m = np.asarray(masses, dtype=float)
+    n = len(X)
+    if n_best is None or n_best >= n:
+        attractors = np.arange(n)
+    else:
+        attractors = np.sort(np.argpartition(m, n - n_best)[n - n_best:])
+    Y = X[attractors]
+    mY = m[attractors]
+    d = X.shape[1]
+    # the temporary arrays of shape (block, k, d) and about 2 of shape (block, k)
+    block = max(1, max_memory // (8 * len(attractors) * (d + 2)))
+    A = np.empty_like(X)
+    for start in range(0, n, block):
+        Xb = X[start:start+block]
+        D = Y - Xb[:, None, :]
+        R = np.sqrt(np.einsum('ijk,ijk->ij', D, D))
+        W = np.random.random(R.shape)
+        W *= gravity_coefficient * mY
+        W /= R ** 3 + epsilon
+        # no self-attraction
+        W[np.arange(start, start+len(Xb))[:, None] == attractors] = 0
+        A[start:start+block] = np.einsum('ij,ijk->ik', W, D)
+    return A
+
+
 class Particle(BaseParticle):
     """A particle in GSA
     
@@ -80,10 +127,11 @@ class GravitySearch(PopulationMixin):
     element_class = Particle
     default_size = 20
 
-    params = {'gravity_coefficient': 100, 'attenuation_coefficient': 10}
+    params = {'gravity_coefficient': 100, 'attenuation_coefficient': 10,
+    'n_best': None, 'max_memory': 2**26}
 
     def compute_mass(self):
-        fitnesses = np.asarray([particle.fitness for particle in self])
+        fitnesses = np.asarray(self.get_all_fitness(), dtype=float)
         worst_fitness = np.min(fitnesses)
         best_fitness = np.max(fitnesses)
         epsilon = 0.0001
@@ -91,23 +139,21 @@ class GravitySearch(PopulationMixin):
         return m / m.sum()
 
     def compute_accelerate(self):
-        # compute force
-        D = np.array([[pj.position - pi.position for pi in self] for pj in self])
-        R = squareform(pdist([p.position for p in self]))
-        for i in range(self.n_particles):
-            R[i, i]=1
-        m = self.compute_mass()
-        M = np.tile(m, (self.n_particles, 1))
-        for i in range(self.n_particles):
-            M[i, i]=0
-        M /= R**3
-        M *= self.gravity_coefficient * np.random.random((self.n_particles, self.n_particles))
-        A = M[:,:,None] * D
-        A = A.sum(axis=0)
+        """Compute the accelerations of the particles by `compute_accelerations`
+
+        If `n_best` is set, only the `n_best` heaviest particles attract the others (Kbest GSA);
+        a float in (0, 1) means the proportion of the particles.
+        """
+
+        n_best = self.n_best
+        if n_best is not None and n_best < 1:
+            n_best = max(1, int(n_best * self.n_particles))
+        A = compute_accelerations([p.position for p in self], self.compute_mass(),
+            self.gravity_coefficient, n_best=n_best, max_memory=self.max_memory)
 
         # set accelerate
-        for i, particle in enumerate(self):
-            particle.accelerate = A[i, :]
+        for particle, a in zip(self, A):
+            particle.accelerate = a
 
     def transition(self, k):
         """
@@ -117,6 +163,7 @@ class GravitySearch(PopulationMixin):
         self.move()
         self.gravity_coefficient = exp(-self.attenuation_coefficient*k / self.n_iter)
 
+    @side_effect
     def move(self):
         for particle in self:
             particle.move()
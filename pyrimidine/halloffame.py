@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""Hall of fame: the best individuals found in the evolution
+
+`HallOfFame` is a list of the best individuals, sorted by the fitness in increasing order,
+with the fitness vector `fitness_values` stored along with it.
+It is updated with the fitness vector of a population once in each generation:
+the candidates are filtered by the worst fitness in the hall of fame,
+the survivors are picked by `argpartition`, and only the new survivors are copied.
+
+Example:
+    hof = HallOfFame(pop.get_best_individuals(2, copy=True))
+    hof.update(pop.individuals, pop.get_all_fitness())
+    hof.best, hof.max_fitness
+"""
+
+import numpy as np
+
+from .deco import FitnessMemo
+
+
+class HallOfFame(list):
+    """The best individuals, sorted by the fitness in increasing order
+
+    Attributes:
+        maxsize (int): the maximum number of the individuals
+        fitness_values (array): the fitness of the individuals
+        dedup (bool): whether the individuals with the same genome are recorded once
+    """
+
+    def __init__(self, individuals=(), maxsize=None, fitness=None, dedup=False):
+        """
+        Args:
+            individuals (list, optional): the initial individuals (they are not copied)
+            maxsize (int, optional): the maximum number of the individuals,
+                the number of the initial individuals by default
+            fitness (array, optional): the fitness of the initial individuals
+            dedup (bool, optional): record the individuals with the same genome once
+        """
+
+        individuals = list(individuals)
+        if fitness is None:
+            fitness = [i.fitness for i in individuals]
+        fitness = np.asarray(fitness, dtype=float)
+        order = np.argsort(fitness, kind='stable')
+        super().__init__(individuals[k] for k in order)
+        self.fitness_values = fitness[order]
+        self.maxsize = len(self) if maxsize is None else maxsize
+        self.dedup = dedup
+        self._keys = [FitnessMemo.key(i) for i in self] if dedup else None
+
+    @property
+    def best(self):
+        return self[-1]
+
+    @property
+    def max_fitness(self):
+        return self.fitness_values[-1]
+
+    def update(self, individuals, fitness=None):
+        """Update the hall of fame with the individuals
+
+        Args:
+            individuals (list): the candidates, such as the individuals of a population
+            fitness (array, optional): the fitness of the candidates
+        """
+
+        if self.maxsize <= 0:
+            return
+        if fitness is None:
+            fitness = [i.fitness for i in individuals]
+        fitness = np.asarray(fitness, dtype=float)
+        if len(self) >= self.maxsize:
+            ks = np.flatnonzero(fitness > self.fitness_values[0])
+        else:
+            ks = np.arange(len(fitness))
+
+        if self.dedup and ks.size:
+            keys = set(self._keys)
+            new_keys = []
+            kept = []
+            for k in ks:
+                key = FitnessMemo.key(individuals[k])
+                if key not in keys:
+                    keys.add(key)
+                    kept.append(k)
+                    new_keys.append(key)
+            ks = np.array(kept, dtype=int)
+        if ks.size == 0:
+            return
+
+        combined = np.concatenate((self.fitness_values, fitness[ks]))
+        n = len(combined)
+        m = min(self.maxsize, n)
+        top = np.argpartition(combined, n - m)[n - m:]
+        top = top[np.argsort(combined[top], kind='stable')]
+        n_old = len(self)
+        # only the new survivors are copied
+        members = [self[j] if j < n_old else individuals[ks[j - n_old]].copy() for j in top]
+        if self.dedup:
+            keys = self._keys + new_keys
+            self._keys = [keys[j] for j in top]
+        self[:] = members
+        self.fitness_values = combined[top]
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+"""Recorder of the history of the evolution
+
+`History` appends the rows of statistics into preallocated numpy columns,
+growing geometrically, and builds the `DataFrame` only when it is requested.
+It could also stream the rows to a file (csv, jsonl or parquet) in chunks,
+keeping at most `chunksize` rows in memory.
+When it is pickled with a checkpoint, the rows are flushed to the sink;
+a history restored from the checkpoint keeps the rows written before it,
+and drops those written after it when it writes new rows.
+
+Example:
+    history = History(sink='history.csv')
+    pop.evolve(n_iter=100000, history=history)
+    data = pd.read_csv('history.csv')
+"""
+
+import os
+import pathlib
+
+import numpy as np
+import pandas as pd
+
+
+class History:
+    """Recorder of the rows of statistics
+
+    Attributes:
+        columns (list[str]): the names of the columns
+        n_rows (int): the number of the rows recorded
+    """
+
+    def __init__(self, capacity=64, sink=None, chunksize=1024):
+        """
+        Args:
+            capacity (int, optional): the initial number of the rows of the buffers
+            sink (str | Path, optional): the file the rows are streamed to,
+                whose format is determined by the suffix: '.csv', '.jsonl' (or '.json') or '.parquet'
+            chunksize (int, optional): the number of the rows written to the sink at once
+        """
+
+        self.capacity = capacity
+        self.sink = None if sink is None else pathlib.Path(sink)
+        if self.sink is not None and self.sink.suffix not in {'.csv', '.jsonl', '.json', '.parquet'}:
+            raise ValueError(f'Unknown format of the sink `{sink}`!')
+        self.chunksize = chunksize
+        self.columns = None
+        self.n_rows = 0
+        self._buffers = None
+        self._size = 0      # the number of the rows in the buffers
+        self._writer = None
+        self._offset = None     # the size of the sink (csv/jsonl) saved with the state
+        self._sealed = 0        # the number of the rows in the complete parquet sink
+
+    def __len__(self):
+        return self.n_rows
+
+    def _allocate(self, row):
+        self.columns = list(row.keys())
+        self._buffers = {}
+        for k, v in row.items():
+            dtype = np.asarray(v).dtype
+            if dtype.kind not in 'biuf' or np.ndim(v) > 0:
+                dtype = object
+            self._buffers[k] = np.empty(self.capacity, dtype=dtype)
+
+    def append(self, row):
+        """Append a row
+
+        Args:
+            row (dict): the values of the columns
+        """
+
+        if self._buffers is None:
+            self._allocate(row)
+        if not self.columns:
+            self.n_rows += 1
+            return
+        if self._size == len(self._buffers[self.columns[0]]):
+            # grow the buffers geometrically
+            for k, b in self._buffers.items():
+                self._buffers[k] = np.concatenate((b, np.empty_like(b)))
+        for k in self.columns:
+            b, v = self._buffers[k], row[k]
+            if b.dtype != object:
+                dtype = np.result_type(b.dtype, np.asarray(v).dtype) if np.ndim(v) == 0 else object
+                if dtype != b.dtype:
+                    # e.g. a column of integers gets a float
+                    b = self._buffers[k] = b.astype(dtype)
+            b[self._size] = v
+        self._size += 1
+        self.n_rows += 1
+        if self.sink is not None and self._size >= self.chunksize:
+            self.flush()
+
+    def _frame(self):
+        # the rows in the buffers
+        if not self.columns:
+            return pd.DataFrame(index=pd.RangeIndex(self.n_rows))
+        return pd.DataFrame({k: b[:self._size] for k, b in self._buffers.items()},
+            index=pd.RangeIndex(self.n_rows - self._size, self.n_rows))
+
+    def flush(self):
+        # write the rows in the buffers to the sink, and empty the buffers
+        if self.sink is None or self._size == 0 or not self.columns:
+            return
+        df = self._frame()
+        header = self.n_rows == self._size
+        if self.sink.suffix == '.parquet':
+            self._write_parquet(df)
+        else:
+            if self._offset is not None:
+                # drop the rows written after the state was saved
+                offset, self._offset = self._offset, None
+                if not header and self.sink.exists() and self.sink.stat().st_size > offset:
+                    with open(self.sink, 'r+b') as fo:
+                        fo.truncate(offset)
+            if self.sink.suffix == '.csv':
+                df.to_csv(self.sink, mode='w' if header else 'a', header=header, index=False)
+            else:
+                with open(self.sink, 'w' if header else 'a') as fo:
+                    fo.write(df.to_json(orient='records', lines=True).rstrip('\n') + '\n')
+        self._size = 0
+
+    def _segment(self):
+        # the file of the rows of parquet written after the sink is sealed
+        return self.sink.with_name(self.sink.name + '.part')
+
+    def _write_parquet(self, df):
+        # parquet files could not be appended to, so the rows written after the sink is sealed
+        # go to a segment, which is merged into the sink by `_seal`
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('`pyarrow` is required to write parquet files.')
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            path = self._segment() if self._sealed else self.sink
+            self._writer = pq.ParquetWriter(path, table.schema)
+        self._writer.write_table(table)
+
+    def _seal(self):
+        # close the parquet writer, so that the sink is a complete file holding all the rows flushed
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        if self._sealed:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            segment = self._segment()
+            table = pa.concat_tables([pq.read_table(self.sink), pq.read_table(segment)])
+            temp = self.sink.with_name(self.sink.name + '.tmp')
+            pq.write_table(table, temp)
+            os.replace(temp, self.sink)
+            segment.unlink()
+        self._sealed = self.n_rows - self._size
+
+    def close(self):
+        self.flush()
+        self._seal()
+
+    def __getstate__(self):
+        # flush the rows to the sink, and record the size of the sink;
+        # the sink is only changed when the restored history writes new rows
+        self.flush()
+        self._seal()
+        state = self.__dict__.copy()
+        if self.sink is not None and self.sink.suffix != '.parquet':
+            state['_offset'] = self.sink.stat().st_size if self.sink.exists() else 0
+        return state
+
+    def to_frame(self):
+        """The rows as a DataFrame
+
+        If there is a sink, the rows are read back from it.
+        """
+
+        if self.sink is None:
+            return self._frame()
+        self.close()
+        if self.n_rows == 0:
+            return pd.DataFrame()
+        # the rows written after the state was saved are not read
+        if self.sink.suffix == '.csv':
+            return pd.read_csv(self.sink, nrows=self.n_rows)
+        elif self.sink.suffix in {'.jsonl', '.json'}:
+            return pd.read_json(self.sink, orient='records', lines=True, nrows=self.n_rows)
+        else:
+            return pd.read_parquet(self.sink)
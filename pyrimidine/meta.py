@@ -238,16 +238,20 @@ class MetaContainer(ParamType):
         # attrs['type_check'] = _type_check
 
         def _getstate(self):
+            # the public attributes (e.g. the hall of fame) are kept, but not the caches
             return {'element_class':self.element_class,
             'default_size':self.default_size,
             'elements':self.elements,
-            'params':self.params}
+            'params':self.params,
+            'attrs': {k: v for k, v in self.__dict__.items()
+                if not k.startswith('_') and k not in {'element_class', 'default_size', 'params'}}}
 
         def _setstate(self, state):
             self.element_class = state.get('element_class', self.__class__.element_class)
             self.default_size = state.get('default_size', self.__class__.default_size)
             self.elements = state.get('elements', [])
             self.params = state.get('params', {})
+            self.__dict__.update(state.get('attrs', {}))
 
         attrs.update(
             {'__getstate__': _getstate,
@@ -550,3 +554,23 @@ class MetaArray(ParamType):
             default_size = n
         return cls
 
+
+
+class MetaMatrix(ParamType):
+
+    """Metaclass for the containers storing their elements as the rows of a matrix
+
+    Unlike `MetaContainer`, it does not hold a list of elements,
+    but it keeps the helpers `C[a] // n` to construct the classes.
+    """
+
+    def __getitem__(self, class_):
+        return self.set(element_class=class_)
+
+    def __ifloordiv__(self, n):
+        return self.set(default_size=n)
+
+    def __floordiv__(self, n):
+        class cls(self):
+            default_size = n
+        return cls
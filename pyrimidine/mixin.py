@@ -19,6 +19,13 @@ FitnessMixin  --->  PopulationMixin
 """
 
 
+import asyncio
+import contextvars
+import functools
+import inspect
+import pathlib
+import random as _random
+import threading
 from operator import methodcaller, attrgetter
 
 import numpy as np
@@ -29,11 +36,250 @@ try:
 except:
     from ._stat import Statistics
 
-from .deco import side_effect
+from .deco import side_effect, touch, clear_fitness_memo
+from .history import History
+from .halloffame import HallOfFame
 
 from .errors import *
 
 
+def stack(elements):
+    """Stack the elements as the input of `_fitness_batch`
+
+    If each element is encoded by one chromosome (an array) and all chromosomes
+    have the same shape, then the chromosomes are stacked into a matrix;
+    otherwise it returns the list of the elements.
+
+    Args:
+        elements (list): a list of chromosomes or individuals
+    
+    Returns:
+        array | list
+    """
+
+    genomes = []
+    for e in elements:
+        g = e if isinstance(e, np.ndarray) else getattr(e, 'chromosome', None)
+        if not isinstance(g, np.ndarray) or (genomes and g.shape != genomes[0].shape):
+            return list(elements)
+        genomes.append(g)
+    if genomes:
+        return np.asarray(np.stack(genomes))
+    else:
+        return list(elements)
+
+
+def stack_rows(arrays, dtype=float):
+    """Stack the arrays into a matrix, and get the views of its rows
+
+    It is used by the algorithms storing the states of the elements in matrices,
+    where the elements hold the views of the rows.
+
+    Args:
+        arrays (list): the arrays of the same shape, e.g. the chromosomes
+        dtype (optional): the type of the matrix
+
+    Returns:
+        tuple: the matrix, and the views of its rows of the classes of the arrays
+    """
+
+    arrays = list(arrays)
+    matrix = np.array(arrays, dtype=dtype)
+    return matrix, [row.view(a.__class__) for row, a in zip(matrix, arrays)]
+
+
+def are_row_views(arrays, matrix):
+    # check whether the k-th array is (a part of) the view of the k-th row of the matrix
+    arrays = list(arrays)
+    return (matrix is not None and len(arrays) == len(matrix)
+        and all(np.shares_memory(a, row) for a, row in zip(arrays, matrix)))
+
+
+def evaluate_batch(cls, elements, genomes=None):
+    """Evaluate the elements by `cls._fitness_batch`
+
+    If `cls` has a fitness memo, then only the genomes not in the memo
+    are evaluated, once for each distinct genome.
+
+    Args:
+        cls: the class of the elements defining `_fitness_batch`
+        elements (list): the elements (or the rows of the genome matrix)
+        genomes (array, optional): the input of `_fitness_batch`, `stack(elements)` by default
+    
+    Returns:
+        array: the fitness of the elements
+    """
+
+    memo = cls._fitness_memo
+    if memo is None:
+        return np.asarray(cls._fitness_batch(stack(elements) if genomes is None else genomes), dtype=float)
+
+    fitness = np.empty(len(elements))
+    misses = {}
+    for k, e in enumerate(elements):
+        key = memo.key(e)
+        if key in misses:
+            misses[key].append(k)
+            memo.hits += 1
+            continue
+        f = memo.get(key)
+        if f is None:
+            misses[key] = [k]
+        else:
+            fitness[k] = f
+    if misses:
+        first = [ks[0] for ks in misses.values()]
+        if genomes is None:
+            fs = cls._fitness_batch(stack([elements[k] for k in first]))
+        else:
+            fs = cls._fitness_batch(genomes[first])
+        for (key, ks), f in zip(misses.items(), fs):
+            fitness[ks] = f
+            memo[key] = f
+    return fitness
+
+
+# the event loops reused by `run_sync`: one for each thread, and one running in a background thread
+_loops = threading.local()
+_background_loop = None
+_background_lock = threading.Lock()
+
+
+def _thread_loop():
+    # the event loop of the current thread, created at the first call
+    loop = getattr(_loops, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = _loops.loop = asyncio.new_event_loop()
+    return loop
+
+
+def _get_background_loop():
+    # the event loop running in a daemon thread, started at the first call
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(target=_background_loop.run_forever, daemon=True).start()
+        return _background_loop
+
+
+def run_sync(coro):
+    """Run the coroutine to the end and return its result
+
+    If there is no running loop in the current thread, the coroutine runs in the loop of the thread;
+    otherwise it runs in the loop of a background thread.
+    The loops are created once and reused by the following calls.
+    """
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        return _thread_loop().run_until_complete(coro)
+    if running is _background_loop:
+        # called by a coroutine in the background loop, which should not wait for itself
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
+
+
+async def to_thread(func, *args, **kwargs):
+    # run the function in the default executor, as `asyncio.to_thread` (Python 3.9+)
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, functools.partial(context.run, func, *args, **kwargs))
+
+
+def is_async(cls):
+    # whether `_fitness` of the class is a coroutine function
+    return inspect.iscoroutinefunction(getattr(cls, '_fitness', None))
+
+
+_compressors = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'lzma'}
+
+
+def _open(path, mode='rb', suffix=None):
+    # open the file, compressed according to the suffix (of the path by default)
+    import importlib
+    suffix = suffix or pathlib.Path(path).suffix
+    if suffix in _compressors:
+        return importlib.import_module(_compressors[suffix]).open(path, mode)
+    return open(path, mode)
+
+
+def _dump(obj, path):
+    """Pickle the object to the file atomically
+
+    The object is written to a temporary file in the same folder first,
+    so the file is never left half-written.
+    """
+
+    import os, pickle, tempfile
+    path = pathlib.Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    os.close(fd)
+    try:
+        with _open(tmp, 'wb', suffix=path.suffix) as fo:
+            pickle.dump(obj, fo, protocol=pickle.HIGHEST_PROTOCOL)
+            fo.flush()
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _load(path):
+    import pickle
+    with _open(path, 'rb') as fo:
+        return pickle.load(fo)
+
+
+def _genomes(elements):
+    """The genomes of the elements as raw arrays, saved in the checkpoints
+
+    The chromosomes are stacked into a matrix, or a list of matrices
+    (one for each chromosome of the individuals); the populations give their states.
+    """
+
+    def _matrix(arrays):
+        arrays = [np.asarray(a) for a in arrays]
+        if all(a.shape == arrays[0].shape for a in arrays):
+            return np.stack(arrays)
+        return arrays
+
+    if len(elements) == 0:
+        return []
+    if isinstance(elements[0], np.ndarray):
+        return _matrix(elements)
+    if isinstance(elements[0], PopulationMixin):
+        return [e.get_state() for e in elements]
+    return [_matrix(e[k] for e in elements) for k in range(len(elements[0]))]
+
+
+def _from_genomes(template, genomes):
+    # the elements with the genomes (got by `_genomes`), of the same type as the template
+    if isinstance(template, np.ndarray):
+        return [template.__class__(g) for g in genomes]
+    if isinstance(template, PopulationMixin):
+        elements = []
+        for state in genomes:
+            e = template.copy()
+            e.set_state(state)
+            elements.append(e)
+        return elements
+    return [template.__class__([c.__class__(g) for c, g in zip(template, gs)])
+        for gs in zip(*genomes)]
+
+
+def _stamp(element):
+    # the number of the changes of the element and its chromosomes (see `deco.touch`)
+    s = getattr(element, '_stamp', 0)
+    if not isinstance(element, np.ndarray):
+        for c in getattr(element, 'chromosomes', ()):
+            s += getattr(c, '_stamp', 0)
+    return s
+
+
 class IterativeMixin:
     # Mixin class for iterative algrithms
 
@@ -70,7 +316,12 @@ class IterativeMixin:
         for k in range(1, n_iter+1):
             self.transition(k)
 
-    def evolve(self, initialize:bool=True, n_iter:int=100, period:int=1, verbose:bool=False, history=False, stat=None, attrs=('solution',), control=None):
+    async def aezolve(self, *args, **kwargs):
+        # the asynchronous counterpart of `ezolve`, running in a worker thread
+        return await to_thread(self.ezolve, *args, **kwargs)
+
+    def evolve(self, initialize:bool=True, n_iter:int=100, period:int=1, verbose:bool=False, history=False, stat=None, attrs=('solution',), control=None,
+        checkpoint=None, checkpoint_period:int=100, start:int=0):
         """Get the history of the whole evolution
 
         Keyword Arguments:
@@ -79,11 +330,17 @@ class IterativeMixin:
             verbose {bool} -- to print the iteration process
             stat {dict} -- a dict(key: function mapping from the object to a number) of statistics 
                            The value could be a string that should be a method pre-defined.
-            history {bool|DataFrame} -- True for recording history, or a DataFrame object recording previous history.
+            history {bool|DataFrame|History} -- True for recording history, or a DataFrame object recording previous history,
+                           or a `History` object (that could stream the history to a file).
             attrs {tuple[str]} -- attributes of the object
+            checkpoint {str|Path} -- the path of the checkpoint file, saved every `checkpoint_period` iterations,
+                           compressed if the suffix is '.gz', '.bz2' or '.xz' (see `resume`);
+                           the state of the object is saved (see `get_state`), instead of the object
+            checkpoint_period {integer} -- the period of the checkpoints
+            start {integer} -- the number of the iterations that have been done (used by `resume`)
         
         Returns:
-            DataFrame | None
+            DataFrame | History | None
         """
 
         assert control is None or callable(control)
@@ -95,16 +352,18 @@ class IterativeMixin:
         if initialize:
             self.init()
 
-        if history is True:
+        if history is True or (isinstance(history, History) and start == 0):
+            if history is True:
+                history = History()
             res = stat(self) if stat else {}
-            history = pd.DataFrame(data={k:[v] for k, v in res.items()})
-            history_flag = True
-        elif history is False:
-            history_flag = False
+            history.append(res)
         elif isinstance(history, pd.DataFrame):
-            history_flag = True
-        else:
-            raise TypeError('The argument `history` should be an instance of `pandas.DataFrame` or `bool`.')
+            previous, history = history, History()
+            for row in previous.to_dict('records'):
+                history.append(row)
+        elif history is not False and not isinstance(history, History):
+            raise TypeError('The argument `history` should be an instance of `pandas.DataFrame`, `History` or `bool`.')
+        history_flag = history is not False
         # n_iter = n_iter or self.n_iter
         if verbose:
             from toolz.itertoolz import concat
@@ -115,20 +374,81 @@ class IterativeMixin:
 -------------------------------------------------------------
 {" & ".join(map(str, concat((("[0]",), (getattr(self, attr) for attr in attrs), map(str, res.values())))))}""")
 
-        for t in range(1, n_iter+1):
+        for t in range(start+1, n_iter+1):
             self.transition(t)
             if history_flag and (period == 1 or t % period ==0):
                 res = stat(self) if stat else {}
-                history = pd.concat([history,
-                    pd.Series(res.values(), index=res.keys()).to_frame().T],
-                    ignore_index=True)
+                history.append(res)
             if verbose and (period == 1 or t % period ==0):
                 print(f'{" & ".join(map(str, concat((("[%d]"%t,), (getattr(self, attr) for attr in attrs), map(str, res.values())))))}')
-            
+            if checkpoint and t % checkpoint_period == 0:
+                _dump({'state': self.get_state(), 'iteration': t, 'n_iter': n_iter, 'period': period,
+                    'history': history, 'checkpoint_period': checkpoint_period,
+                    'random_state': (np.random.get_state(), _random.getstate())}, checkpoint)
+
             if control:
                 if control(self):
                     break
-        return history
+
+        if not history_flag:
+            return history
+        elif history.sink is not None:
+            history.close()
+            return history
+        else:
+            return history.to_frame()
+
+    @classmethod
+    def resume(cls, checkpoint, **kwargs):
+        """Resume the evolution from the checkpoint saved by `evolve`
+
+        The object is rebuilt from its state (see `get_state`) as an instance of `cls`,
+        the history and the random states are restored,
+        and the evolution continues as if it had not been interrupted.
+        The other arguments of `evolve`, such as `stat` and `control`, are not saved,
+        and should be passed again.
+
+        Args:
+            checkpoint (str | Path): the path of the checkpoint file
+            **kwargs: the other keyword arguments of `evolve`
+        
+        Returns:
+            the object restored, and the output of `evolve`
+        """
+
+        snapshot = _load(checkpoint)
+        obj = cls.from_state(snapshot['state'])
+        if not isinstance(obj, cls):
+            raise TypeError(f'The object loaded is not an instance of "{cls}".')
+        np_state, state = snapshot['random_state']
+        np.random.set_state(np_state)
+        _random.setstate(state)
+        kwargs = {'n_iter': snapshot['n_iter'], 'period': snapshot['period'],
+            'history': snapshot['history'], 'checkpoint': checkpoint,
+            'checkpoint_period': snapshot['checkpoint_period'], **kwargs}
+        return obj, obj.evolve(initialize=False, start=snapshot['iteration'], **kwargs)
+
+    def get_state(self):
+        """The state of the object saved in the checkpoints (see `evolve`)
+
+        It is the object itself by default, so the class should be defined at the top level of a module;
+        the populations save the genomes of the elements instead (see `PopulationMixin.get_state`).
+        """
+
+        return self
+
+    @classmethod
+    def from_state(cls, state):
+        # rebuild the object from the state got by `get_state`
+        return state
+
+    async def aevolve(self, *args, **kwargs):
+        """The asynchronous counterpart of `evolve`
+
+        The evolution runs in a worker thread, so it does not block the running event loop.
+        """
+
+        return await to_thread(self.evolve, *args, **kwargs)
 
     def perf(self, n_repeats=10, timing=True, *args, **kwargs):
         """Get performance of Algo.
@@ -182,6 +502,9 @@ class IterativeMixin:
     def save(self, filename=None, check=False):
         """Save the object to file using pickle
         
+        The file is written atomically, and compressed if its suffix is '.gz', '.bz2' or '.xz'
+        (e.g. 'model.pkl.gz'); otherwise the suffix is replaced with '.pkl'.
+
         Args:
             filename (None, optional): the path of the pickle file
             check (bool, optional): check whether the file has existed.
@@ -189,15 +512,15 @@ class IterativeMixin:
         Raises:
             FileExistsError: Description
         """
-        import pickle, pathlib
+
         if filename is None:
-            filename = f'{self.__class__.__name__}-{self.__name__}'
-        if isinstance(filename, str):
-            pklPath = pathlib.Path(filename).with_suffix('.pkl')
+            filename = f'{self.__class__.__name__}'
+        pklPath = pathlib.Path(filename)
+        if pklPath.suffix not in _compressors:
+            pklPath = pklPath.with_suffix('.pkl')
         if check and pklPath.exists():
             raise FileExistsError(f'File {filename} has existed!')
-        with open(pklPath, 'wb') as fo:
-            pickle.dump(self, fo)
+        _dump(self, pklPath)
 
     @classmethod
     def load(cls, filename=None):
@@ -212,20 +535,22 @@ class IterativeMixin:
         Raises:
             FileNotFoundError: Do not find the file
         """
-        import pickle, pathlib
+
         if filename is None:
-            filename = f'{cls.__name__}-{pop}'
-        if isinstance(filename, str):
-            pklPath = pathlib.Path(filename).with_suffix('.pkl')
+            filename = f'{cls.__name__}'
+        pklPath = pathlib.Path(filename)
+        if pklPath.suffix not in _compressors:
+            pklPath = pklPath.with_suffix('.pkl')
         if pklPath.exists():
-            with open(pklPath, 'rb') as fo:
-                obj = pickle.load(fo)
-                if not isinstance(obj, cls):
-                    raise TypeError('The object loaded is not an instance of "{cls}".')
+            obj = _load(pklPath)
+            if not isinstance(obj, cls):
+                raise TypeError(f'The object loaded is not an instance of "{cls}".')
+            return obj
         else:
             raise FileNotFoundError(f'Could not find the file {filename}!')
 
     def after_setter(self):
+        touch(self)
         if hasattr(self, '_cache'):
             self.clear_cache()
 
@@ -238,20 +563,72 @@ class FitnessMixin(IterativeMixin):
     """Iterative models drived by the fitness/objective function
 
     The fitness should be stored until the the state of the model is changed.
+
+    Optionally, define the classmethod `_fitness_batch(cls, genomes)`,
+    returning the fitness of many objects at once,
+    where `genomes` is the output of `stack`.
+    The populations will call it once instead of calling `_fitness` of each element.
+
+    `_fitness` could be a coroutine function (`async def _fitness(self)`), for the I/O-bound fitness;
+    then the populations evaluate their elements concurrently, see `PopulationMixin.aget_all_fitness`.
     
     Extends:
         IterativeMixin
     """
 
+    _fitness_memo = None
+
     def get_fitness(self):
         raise NotImplementedError
 
     def _fitness(self):
+        if hasattr(self.__class__, '_fitness_batch'):
+            return self._fitness_batch(stack([self]))[0]
         raise NotImplementedError
 
+    def _evaluate(self):
+        # call `_fitness`, and run it to the end if it is a coroutine function
+        f = self._fitness()
+        if inspect.isawaitable(f):
+            return run_sync(f)
+        return f
+
     @property
     def fitness(self):
-        return self._fitness()
+        # look up the fitness memo if the class has one (see `memoize_fitness`)
+        memo = self.__class__._fitness_memo
+        if memo is None:
+            return self._evaluate()
+        key = memo.key(self)
+        f = memo.get(key)
+        if f is None:
+            f = memo[key] = self._evaluate()
+        return f
+
+    async def aget_fitness(self):
+        """The asynchronous counterpart of `fitness`
+
+        The cached fitness and the fitness memo are looked up before awaiting `_fitness`.
+        """
+
+        cache = getattr(self, '_cache', None)
+        if cache and cache.get('fitness') is not None:
+            return cache['fitness']
+        memo = self.__class__._fitness_memo
+        if memo is not None:
+            key = memo.key(self)
+            f = memo.get(key)
+        else:
+            f = None
+        if f is None:
+            f = self._fitness()
+            if inspect.isawaitable(f):
+                f = await f
+            if memo is not None:
+                memo[key] = f
+        if cache is not None:
+            self.set_cache(fitness=f)
+        return f
 
     @classmethod
     def set_fitness(cls, f=None, decode=None):
@@ -271,13 +648,38 @@ class FitnessMixin(IterativeMixin):
                 f = globals()['_fitness']
             else:
                 raise Exception('Function `_fitness` is not defined before setting fitness. You may forget to create the class in the context of environment.')
-        if not decode:
+        if inspect.iscoroutinefunction(f):
+            if not decode:
+                async def _fitness(obj):
+                    return await f(obj)
+            else:
+                async def _fitness(obj):
+                    return await f(obj.decode())
+        elif not decode:
             def _fitness(obj):
                 return f(obj)
         else:
             def _fitness(obj):
                 return f(obj.decode())
         cls._fitness = _fitness
+        clear_fitness_memo(cls)
+        return cls
+
+    @classmethod
+    def set_fitness_batch(cls, f):
+        """Set the method `_fitness_batch`
+        
+        Args:
+            f (function): function to evalute the fintess of the stacked objects
+        
+        Returns:
+            A class with the batch fitness `f`
+        """
+
+        def _fitness_batch(cls, genomes):
+            return f(genomes)
+        cls._fitness_batch = classmethod(_fitness_batch)
+        clear_fitness_memo(cls)
         return cls
 
     def evolve(self, stat=None, *args, **kwargs):
@@ -343,8 +745,75 @@ class PopulationMixin(FitnessMixin, CollectiveMixin):
     """mixin class for population-based heuristic algorithm
 
     It is consisted of a collection of solutions.
+
+    The fitness vector of the elements is cached (see `get_all_fitness`),
+    so the statistics of one generation read the same vector.
+    It is cleared by the setters and the methods with `side_effect` of the population,
+    and recomputed once an element is replaced or changed by its setters, `set_memory`
+    or its methods with `side_effect` (see `deco.touch`);
+    call `clear_cache` if you change the elements in place by other means,
+    e.g. by writing into the arrays of the chromosomes.
+
+    Attributes:
+        max_concurrency (int): the maximum number of the fitness evaluations in flight,
+            if `_fitness` of the elements is a coroutine function
     """
 
+    max_concurrency = 64
+
+    _fitness_vector = None
+    _fitness_key = None
+    _sorted_cache = None
+
+    def clear_cache(self, *args, **kwargs):
+        # clear the fitness vector and the order of the elements
+        self._fitness_vector = None
+        self._fitness_key = None
+        self._sorted_cache = None
+
+    def after_setter(self):
+        self.clear_cache()
+
+    def get_state(self):
+        """The state of the population saved in the checkpoints (see `evolve`)
+
+        It consists of the genomes of the elements as raw arrays, the fitness vector, `params`
+        and the hall of fame (if any), so the classes (e.g. the local classes made by `C // n`) are not pickled.
+        Override it with `set_state` to save the other states of an algorithm.
+        """
+
+        state = {'genomes': _genomes(self.elements), 'fitness': self.get_all_fitness(), 'params': self.params}
+        hof = getattr(self, 'hall_of_fame', None)
+        if isinstance(hof, HallOfFame):
+            state['hall_of_fame'] = {'genomes': _genomes(hof), 'fitness': hof.fitness_values,
+                'maxsize': hof.maxsize, 'dedup': hof.dedup}
+        return state
+
+    def set_state(self, state):
+        """Restore the state got by `get_state`
+
+        The elements are rebuilt with the same types as the present elements.
+        """
+
+        template = self[0]
+        self.params = state['params']
+        self.elements = _from_genomes(template, state['genomes'])
+        self.set_all_fitness(state['fitness'])
+        for e, f in zip(self, self._fitness_vector):
+            if hasattr(e, '_cache'):
+                e.set_cache(fitness=f)
+        if 'hall_of_fame' in state:
+            hof = state['hall_of_fame']
+            self.hall_of_fame = HallOfFame(_from_genomes(template, hof['genomes']), fitness=hof['fitness'],
+                maxsize=hof['maxsize'], dedup=hof['dedup'])
+
+    @classmethod
+    def from_state(cls, state):
+        # the elements of a random population are the templates of the elements
+        obj = cls.random()
+        obj.set_state(state)
+        return obj
+
     def evolve(self, stat=None, *args, **kwargs):
         """Get the history of the whole evolution
         """
@@ -363,6 +832,15 @@ class PopulationMixin(FitnessMixin, CollectiveMixin):
             raise AttributeError(f'{cls.element_class} does not have `set_fitness`')
         return cls
 
+    @classmethod
+    def set_fitness_batch(cls, *args, **kwargs):
+        # set batch fitness for the element_class.
+        if hasattr(cls.element_class, 'set_fitness_batch'):
+            cls.element_class.set_fitness_batch(*args, **kwargs)
+        else:
+            raise AttributeError(f'{cls.element_class} does not have `set_fitness_batch`')
+        return cls
+
     @property
     def fitness(self):
         # The fitness of the entire population is the maximum fitness of the individuals
@@ -377,7 +855,87 @@ class PopulationMixin(FitnessMixin, CollectiveMixin):
     #     return self.max_fitness
 
     def get_all_fitness(self):
-        return list(self.map(attrgetter('fitness'), self))
+        """The fitness vector of the elements
+
+        The vector is cached until `clear_cache` is called,
+        or an element is replaced or changed (see `_stamp`).
+        """
+
+        if not self._is_fitness_cached():
+            self.set_all_fitness(self._get_fitness(self.elements))
+        return self._fitness_vector
+
+    def set_all_fitness(self, fitness):
+        # cache the known fitness vector of the present elements
+        self._fitness_vector = np.asarray(fitness)
+        self._fitness_key = [(e, _stamp(e)) for e in self.elements]
+        self._sorted_cache = None
+
+    def _is_fitness_cached(self):
+        # whether the cached fitness vector is of the present elements in their present states
+        key = self._fitness_key
+        return (self._fitness_vector is not None and key is not None and len(key) == len(self)
+            and all(e is f and _stamp(e) == s for e, (f, s) in zip(self.elements, key)))
+
+    def _get_fitness(self, elements):
+        """Get the fitness of the elements
+
+        Call `_fitness_batch` of the element class once, if it is defined,
+        where the elements with cached fitness are skipped;
+        otherwise get the fitness of the elements one by one,
+        or concurrently if `_fitness` of the elements is a coroutine function.
+
+        Returns:
+            array: the fitness of the elements
+        """
+
+        if not hasattr(self.element_class, '_fitness_batch'):
+            if is_async(self.element_class):
+                return np.asarray(run_sync(self._gather_fitness(elements)))
+            return np.asarray(list(self.map(attrgetter('fitness'), elements)))
+
+        fitness = np.empty(len(elements))
+        dirty = []
+        for k, e in enumerate(elements):
+            cache = getattr(e, '_cache', None)
+            if cache and cache.get('fitness') is not None:
+                fitness[k] = cache['fitness']
+            else:
+                dirty.append(k)
+        if dirty:
+            fitness[dirty] = evaluate_batch(self.element_class, [elements[k] for k in dirty])
+            for k in dirty:
+                if hasattr(elements[k], '_cache'):
+                    elements[k].set_cache(fitness=fitness[k])
+        return fitness
+
+    async def _gather_fitness(self, elements, max_concurrency=None):
+        # evaluate the elements concurrently, with at most `max_concurrency` evaluations in flight
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _fitness(e):
+            async with semaphore:
+                return await e.aget_fitness()
+
+        return list(await asyncio.gather(*map(_fitness, elements)))
+
+    async def aget_all_fitness(self, max_concurrency=None):
+        """The asynchronous counterpart of `get_all_fitness`
+
+        The elements are evaluated concurrently, whether there is a running event loop or not.
+
+        Args:
+            max_concurrency (int, optional): the maximum number of evaluations in flight
+        """
+
+        if hasattr(self.element_class, '_fitness_batch'):
+            return self._get_fitness(self.elements)
+        return np.asarray(await self._gather_fitness(self.elements, max_concurrency))
+
+    @property
+    def fitness_memo(self):
+        # the fitness memo of the elements, with the counters `hits` and `misses`
+        return getattr(self.element_class, '_fitness_memo', None)
 
     def get_all(self, key='fitness'):
         return list(self.map(attrgetter(key)), self)
@@ -483,8 +1041,20 @@ class PopulationMixin(FitnessMixin, CollectiveMixin):
         ks = self.argsort()
         self.__elements = self[ks]
 
+    def _sorted_fitness(self):
+        """The fitness vector, the order of the elements by the fitness and the sorted fitness
+
+        They are cached along with the fitness vector.
+        """
+
+        fitness = self.get_all_fitness()
+        if self._sorted_cache is None or self._sorted_cache[0] is not fitness:
+            order = np.argsort(fitness, kind='stable')
+            self._sorted_cache = fitness, order, fitness[order]
+        return self._sorted_cache
+
     def argsort(self):
-        return np.argsort(self.get_all_fitness())
+        return self._sorted_fitness()[1]
 
     def drop(self, n=1):
         if n < 1:
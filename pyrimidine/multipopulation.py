@@ -2,25 +2,134 @@
 
 
 from itertools import product
-import threading
+import random as _random
+
+import numpy as np
 
 from .base import BasePopulation, BaseMultiPopulation
+from .parallel import thread_map
 from .utils import *
 
 
+def _island(population, conn):
+    """The worker evolving one island
+
+    It receives `(n_iter, migrants, n_migrants)` from the main process,
+    takes in the migrants, evolves `n_iter` generations and sends back its best individuals,
+    until it receives `None`; then it sends back the population.
+    The population is initialized before the first round.
+    """
+
+    # the forked workers should not share the random state
+    np.random.seed()
+    _random.seed()
+    try:
+        population.init()
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            n_iter, migrants, n_migrants = msg
+            if migrants:
+                population.extend(migrants)
+                population.drop(len(migrants))
+            population.ezolve(n_iter=n_iter, init=False)
+            conn.send(population.get_best_individuals(n_migrants, copy=True))
+        conn.send(population)
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+def _sources(topology, n):
+    # the islands sending migrants to each island
+    if topology == 'ring':
+        return [[(k-1) % n] for k in range(n)]
+    elif topology == 'full':
+        return [[j for j in range(n) if j != k] for k in range(n)]
+    elif topology == 'random':
+        return [[(k + randint(1, n-1)) % n] for k in range(n)]
+    else:
+        raise ValueError(f'Unknown topology `{topology}`!')
+
+
 class MultiPopulation(BaseMultiPopulation):
 
     def mate(self):
         for p in self:
             p.mate()
 
+    def evolve_islands(self, n_iter=100, interval=10, topology='ring', n_migrants=1, context=None):
+        """Island model: evolve each population in its own process
+
+        The populations (islands) evolve `interval` generations independently,
+        then the best `n_migrants` individuals of each island migrate to its neighbours
+        by pipes, replacing the worst individuals there.
+        Finally the populations are gathered back to the object.
+
+        The populations and the migrants are pickled,
+        so their classes should be defined at the top level of a module.
+
+        Args:
+            n_iter (int, optional): the number of generations
+            interval (int, optional): the number of local generations between two migrations
+            topology (str, optional): 'ring', 'full' (fully connected) or 'random',
+                where each island receives the migrants from one random island in each migration
+            n_migrants (int, optional): the number of migrants sent by each island
+            context (str, optional): the start method of the processes, see `multiprocessing.get_context`
+
+        Returns:
+            the object itself
+        """
+
+        import multiprocessing as mp
+        ctx = mp.get_context(context)
+        n = self.n_populations
+        if n > 1:
+            _sources(topology, n)
+
+        conns, workers = [], []
+        for population in self:
+            conn, child_conn = ctx.Pipe()
+            worker = ctx.Process(target=_island, args=(population, child_conn), daemon=True)
+            worker.start()
+            child_conn.close()
+            conns.append(conn)
+            workers.append(worker)
+
+        def _recv(conn):
+            msg = conn.recv()
+            if isinstance(msg, Exception):
+                raise msg
+            return msg
+
+        try:
+            migrants = [[] for _ in range(n)]
+            for t in range(0, n_iter, interval):
+                for conn, m in zip(conns, migrants):
+                    conn.send((min(interval, n_iter - t), m, n_migrants))
+                bests = [_recv(conn) for conn in conns]
+                if n > 1:
+                    migrants = [[i for j in sources for i in bests[j]] for sources in _sources(topology, n)]
+            for conn in conns:
+                conn.send(None)
+            self.populations = [_recv(conn) for conn in conns]
+        finally:
+            for conn, worker in zip(conns, workers):
+                conn.close()
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
+        return self
+
 
 class DualPopulation(MultiPopulation):
 
     """Multi-population composed by male and female population
     """
     
-    params = {'n_elders':0.5, 'mate_prob':0.75}
+    params = {'n_elders':0.5, 'mate_prob':0.75, 'n_workers':None}
 
     default_size = 2
 
@@ -51,20 +160,15 @@ class DualPopulation(MultiPopulation):
     def mate(self):
         self.populations[0].rank(tied=True)
         self.populations[1].rank(tied=True)
-        children = []
         def _target(male, female):
             if random()<0.5:
-                child = male.cross(female)
+                return male.cross(female)
             else:
-                child = female.cross(male)
-            children.append(child)
-        ps = [threading.Thread(target=_target, args=(male, female)) for male, female in product(self.males, self.females)
+                return female.cross(male)
+        pairs = [(male, female) for male, female in product(self.males, self.females)
             if random() < self.mate_prob and self.match(male, female)]
-
-        for p in ps:
-            p.start()
-        for p in ps:
-            p.join()
+        # the pairs are crossed in the shared thread pool (`n_workers` threads)
+        children = list(thread_map(_target, *zip(*pairs), n_workers=self.n_workers)) if pairs else []
 
         self.populations[0].extend(children[::2])
         self.populations[1].extend(children[1::2])
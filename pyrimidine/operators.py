@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+
+"""Genetic operators acting on the arrays of a whole population
+
+The functions only take arrays (such as the fitness vector) and return the indexes
+of the selected individuals, so they apply to any kind of population.
+
+Selection:
+    tournament: tournament selection without replacement (the winners are different)
+    tournament_with_replacement: tournament selection with replacement
+    stochastic_universal_sampling: fitness-proportionate selection with evenly spaced pointers
+    truncation: select the best individuals
+
+Crossover (the offspring of the parent pairs as a block of genomes):
+    one_point: one-point crossover
+    two_point: two-point crossover
+    uniform: uniform crossover
+    arithmetic: the random convex combination of the parents (for float genomes)
+    blend: blend crossover, BLX-alpha (for float genomes)
+    sbx: simulated binary crossover (for float genomes)
+"""
+
+import numpy as np
+
+
+def _sample(m, n, k):
+    """Draw `n` samples of `k` different integers in range(m) (k < m)
+
+    The samples are drawn with replacement and the ones with repeated integers are redrawn,
+    unless `m` is small, where the `k` smallest of `m` random keys are taken.
+
+    Returns:
+        array: the samples of shape (n, k)
+    """
+
+    if m < k * k:
+        return np.argpartition(np.random.random((n, m)), k-1, axis=1)[:, :k]
+    samples = np.random.randint(m, size=(n, k))
+    while True:
+        s = np.sort(samples, axis=1)
+        repeated = np.any(s[:, 1:] == s[:, :-1], axis=1)
+        if not np.any(repeated):
+            return samples
+        samples[repeated] = np.random.randint(m, size=(np.count_nonzero(repeated), k))
+
+
+def tournament(fitness, n_sel, tourn_size=5):
+    """Tournament selection without replacement
+
+    Select the best individual among `tourn_size` different individuals chosen randomly,
+    `n_sel` times, and the winners are different.
+
+    All the tournaments of one round are drawn at once;
+    the repeated winners are dropped and the tournaments are drawn again
+    among the rest, until there are `n_sel` different winners.
+
+    Args:
+        fitness (array): the fitness of the individuals
+        n_sel (int): the number of winners
+        tourn_size (int): the size of each tournament
+
+    Returns:
+        array: the indexes of the winners
+    """
+
+    rest = np.arange(len(fitness))
+    winners = [np.array([], dtype=int)]
+    n_rest = min(n_sel, len(fitness))
+    while n_rest > 0:
+        if rest.size <= tourn_size:
+            # the rest individuals win in the order of fitness
+            winners.append(rest[np.argsort(-fitness[rest], kind='stable')[:n_rest]])
+            break
+        aspirants = rest[_sample(rest.size, n_rest, tourn_size)]
+        w = aspirants[np.arange(n_rest), np.argmax(fitness[aspirants], axis=1)]
+        _, first = np.unique(w, return_index=True)
+        w = w[np.sort(first)]
+        winners.append(w)
+        n_rest -= w.size
+        rest = np.setdiff1d(rest, w, assume_unique=True)
+    return np.concatenate(winners)
+
+
+def tournament_with_replacement(fitness, n_sel, tourn_size=5):
+    """Tournament selection with replacement
+
+    An individual may win several tournaments.
+    """
+
+    aspirants = np.random.randint(len(fitness), size=(n_sel, tourn_size))
+    return aspirants[np.arange(n_sel), np.argmax(fitness[aspirants], axis=1)]
+
+
+def stochastic_universal_sampling(fitness, n_sel):
+    """Stochastic universal sampling (SUS)
+
+    Fitness-proportionate selection with `n_sel` evenly spaced pointers,
+    where the fitness is shifted so that the worst individual has weight 0.
+    """
+
+    n = len(fitness)
+    weights = fitness - np.min(fitness)
+    total = np.sum(weights)
+    if total <= 0:
+        weights = np.ones(n)
+        total = n
+    step = total / n_sel
+    pointers = (np.random.random() + np.arange(n_sel)) * step
+    ks = np.searchsorted(np.cumsum(weights), pointers, side='right')
+    return np.random.permutation(np.minimum(ks, n-1))
+
+
+def truncation(fitness, n_sel):
+    # select the best `n_sel` individuals
+    if n_sel >= len(fitness):
+        return np.argsort(fitness)[::-1]
+    ks = np.argpartition(fitness, -n_sel)[-n_sel:]
+    return ks[np.argsort(-fitness[ks], kind='stable')]
+
+
+def select(fitness, n_sel, selection='tournament', tourn_size=5):
+    """Select the individuals by the fitness vector
+
+    Args:
+        fitness (array): the fitness of the individuals
+        n_sel (int): the number of individuals to be selected
+        selection (str, optional): the name of the selection method, one of
+            'tournament', 'tournament_with_replacement',
+            'stochastic_universal_sampling' (or 'sus'), 'truncation'
+        tourn_size (int, optional): the size of each tournament
+
+    Returns:
+        array: the indexes of the selected individuals
+
+    Raises:
+        ValueError: unknown selection method
+    """
+
+    fitness = np.asarray(fitness)
+    if selection == 'tournament':
+        return tournament(fitness, n_sel, tourn_size)
+    elif selection == 'tournament_with_replacement':
+        return tournament_with_replacement(fitness, n_sel, tourn_size)
+    elif selection in {'stochastic_universal_sampling', 'sus'}:
+        return stochastic_universal_sampling(fitness, n_sel)
+    elif selection == 'truncation':
+        return truncation(fitness, n_sel)
+    else:
+        raise ValueError(f'Unknown selection method `{selection}`!')
+
+
+def _parents(genomes, pairs):
+    pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+    return np.asarray(genomes[pairs[:, 0]]), np.asarray(genomes[pairs[:, 1]])
+
+
+def _float_parents(genomes, pairs):
+    # the parents for the crossover methods producing new values of genes
+    A, B = _parents(genomes, pairs)
+    if not np.issubdtype(A.dtype, np.floating):
+        raise TypeError(f'The crossover method is for float genomes, but the genomes are of `{A.dtype}`!')
+    return A, B
+
+
+def one_point(genomes, pairs):
+    """One-point crossover
+
+    Args:
+        genomes (array): the genome matrix of the population
+        pairs (array): the index pairs of the parents, of shape (n_pairs, 2)
+
+    Returns:
+        array: the genomes of the offspring, one child for each pair,
+            the first parents if the genomes have less than 2 genes (there is no cut)
+    """
+
+    A, B = _parents(genomes, pairs)
+    d = A.shape[1]
+    if d < 2:
+        return A
+    cuts = np.random.randint(1, d, size=len(A))
+    return np.where(np.arange(d) < cuts[:, None], A, B)
+
+
+def two_point(genomes, pairs):
+    # two-point crossover: the genes between the two cuts come from the second parent
+    A, B = _parents(genomes, pairs)
+    d = A.shape[1]
+    if d < 2:
+        return A
+    cuts = np.sort(np.random.randint(1, d, size=(len(A), 2)), axis=1)
+    ks = np.arange(d)
+    return np.where((cuts[:, :1] <= ks) & (ks < cuts[:, 1:]), B, A)
+
+
+def uniform(genomes, pairs, indep_prob=0.5):
+    # uniform crossover: each gene comes from the second parent with the proba. `indep_prob`
+    A, B = _parents(genomes, pairs)
+    return np.where(np.random.random(A.shape) < indep_prob, B, A)
+
+
+def arithmetic(genomes, pairs):
+    # arithmetic crossover: a*A + (1-a)*B, where a ~ U(0,1) for each pair
+    A, B = _float_parents(genomes, pairs)
+    a = np.random.random((len(A), 1))
+    return a * A + (1 - a) * B
+
+
+def blend(genomes, pairs, alpha=0.5):
+    """Blend crossover (BLX-alpha)
+
+    Each gene of the child is sampled uniformly from the interval of the genes of the parents,
+    extended by `alpha` times its length at both ends.
+    """
+
+    A, B = _float_parents(genomes, pairs)
+    lo, hi = np.minimum(A, B), np.maximum(A, B)
+    d = alpha * (hi - lo)
+    return np.random.uniform(lo - d, hi + d)
+
+
+def sbx(genomes, pairs, eta=2):
+    """Simulated binary crossover (SBX)
+
+    Args:
+        eta (float, optional): the distribution index; the larger, the closer the child is to the parents
+    """
+
+    A, B = _float_parents(genomes, pairs)
+    u = np.random.random(A.shape)
+    beta = np.where(u <= 0.5, (2 * u) ** (1 / (eta + 1)), (1 / (2 * (1 - u))) ** (1 / (eta + 1)))
+    return 0.5 * ((1 + beta) * A + (1 - beta) * B)
+
+
+_crossovers = {'one_point': one_point, 'two_point': two_point, 'uniform': uniform,
+    'arithmetic': arithmetic, 'blend': blend, 'sbx': sbx}
+
+
+def crossover(genomes, pairs, method='one_point', **kwargs):
+    """Produce the offspring of the parent pairs in one block
+
+    Args:
+        genomes (array): the genome matrix of the population
+        pairs (array): the index pairs of the parents, of shape (n_pairs, 2)
+        method (str | function, optional): the name of the crossover method, one of
+            'one_point', 'two_point', 'uniform', 'arithmetic', 'blend', 'sbx',
+            or a function with the same signature as them
+        **kwargs: the parameters of the method, e.g. `alpha` of 'blend' and `eta` of 'sbx'
+
+    Returns:
+        array: the genomes of the offspring
+
+    Raises:
+        ValueError: unknown crossover method
+        TypeError: 'arithmetic', 'blend' or 'sbx' is applied to the genomes of integers
+    """
+
+    if callable(method):
+        return method(genomes, pairs, **kwargs)
+    if method not in _crossovers:
+        raise ValueError(f'Unknown crossover method `{method}`!')
+    return _crossovers[method](genomes, pairs, **kwargs)
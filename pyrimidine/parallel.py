@@ -4,8 +4,104 @@
 """
 
 
+import os
 import threading
-from dask import compute, delayed
+from math import ceil
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# the thread pools shared by all the objects, indexed by the number of workers
+_thread_pools = {}
+_thread_pools_lock = threading.Lock()
+
+# marks the threads of the shared pools
+_pool_thread = threading.local()
+
+
+def _init_pool_thread():
+    _pool_thread.active = True
+
+
+def get_thread_pool(n_workers=None):
+    """Get the shared thread pool with `n_workers` threads
+
+    The pool is created at the first call and reused later, so that the threads
+    are not created for each element in each generation.
+    Use `thread_map` to map a function in the pool.
+
+    Args:
+        n_workers (int, optional): the number of threads,
+            `min(32, os.cpu_count() + 4)` by default (see `ThreadPoolExecutor`)
+    """
+
+    with _thread_pools_lock:
+        if n_workers not in _thread_pools:
+            _thread_pools[n_workers] = ThreadPoolExecutor(max_workers=n_workers,
+                initializer=_init_pool_thread)
+        return _thread_pools[n_workers]
+
+
+def thread_map(f, *iterables, n_workers=None):
+    """Map the function in the shared thread pool with `n_workers` threads
+
+    If it is called in a thread of a shared pool (e.g. by a nested map),
+    then the function is mapped in the current thread,
+    since the threads waiting for the inner tasks could block the pool.
+
+    Returns:
+        iterator: the results, where the exception raised by `f` is raised again
+    """
+
+    if getattr(_pool_thread, 'active', False):
+        return map(f, *iterables)
+    return get_thread_pool(n_workers).map(f, *iterables)
+
+
+# the read-only data shared by the tasks, set by the map computing them
+_shared = ContextVar('shared', default={})
+
+
+def shared(key=None):
+    """Get the read-only data of the map computing the current task
+
+    The data is loaded by the initializer of the workers of `ProcessPoolMap`,
+    or sent with the tasks of `DaskMap`.
+    In the main process, it is available in `with sharing(data)`, or in `with pmap` for a `ProcessPoolMap`,
+    so the same fitness function works with or without the workers.
+
+    Args:
+        key (str, optional): the name of the data; return all the data if it is None
+    """
+
+    data = _shared.get()
+    if key is None:
+        return data
+    return data[key]
+
+
+@contextmanager
+def sharing(data):
+    """Let `shared` get the data in the block
+
+    Example:
+        with sharing({'X': X}):
+            individual.fitness
+    """
+
+    token = _shared.set(data)
+    try:
+        yield data
+    finally:
+        _shared.reset(token)
+
+
+def _init_worker(data, initializer=None, initargs=()):
+    # the worker process belongs to one map, so the data is kept for all its tasks
+    _shared.set(data)
+    if initializer is not None:
+        initializer(*initargs)
 
 
 class ThreadWithResult(threading.Thread):
@@ -15,7 +111,7 @@ class ThreadWithResult(threading.Thread):
         self._result = None
         self._func = func
         self._args = args
-        self._kwargs
+        self._kwargs = kwargs
 
     def run(self):
         self._result = self._func(*self._args, **self._kwargs)
@@ -26,76 +122,228 @@ class ThreadWithResult(threading.Thread):
 
 
 class MTApply:
-    # The multi-threading version of the method `apply`
+    # The multi-threading version of the method `apply`, run in the shared thread pool
 
-    def __init__(self, type_=None):
+    def __init__(self, type_=None, n_workers=None):
         self.type_ = type_
+        self.n_workers = n_workers
 
     def __get__(self, instance, owner):
         def _map(f, type_=None):
-            threads = [ThreadWithResult(f, e) for e in instance]
-            for p in threads:
-                p.start()
-            for p in threads:
-                p.join()
+            results = thread_map(f, instance, n_workers=self.n_workers)
             type_ = type_ or self.type_
             if type_ is None:
-                return (thread.result if hasattr(thread, 'result') else None for thread in threads)
+                return results
             else:
-                return type_([thread.result if hasattr(thread, 'result') else None for thread in threads])
+                return type_(results)
         return _map
 
 
 class MTMap:
-    # The multi-threading version of the inbuilt function `map`
+    """The multi-threading version of the inbuilt function `map`
 
-    def __init__(self, type_=None):
+    The elements are computed in the shared thread pool (see `thread_map`),
+    and the exception raised in a thread is raised again when getting the results.
+    """
+
+    def __init__(self, type_=None, n_workers=None):
         self.type_ = type_
+        self.n_workers = n_workers
 
     def __call__(self, f, obj, type_=None):
-        threads = [ThreadWithResult(f, e) for e in obj]
-        for p in threads:
-            p.start()
-        for p in threads:
-            p.join()
+        results = thread_map(f, obj, n_workers=self.n_workers)
         type_ = type_ or self.type_
         if type_ is None:
-            return (thread.result if hasattr(thread, 'result') else None for thread in threads)
+            return results
         else:
-            return type_([thread.result if hasattr(thread, 'result') else None for thread in threads])
+            return type_(results)
+
+
+def _map_chunk(f, chunk, data=None):
+    # compute a chunk of elements in one task, with the shared data of the map
+    with sharing(data or {}):
+        return [f(e) for e in chunk]
+
+
+class DaskMap:
+    """The parallel version of the inbuilt function `map` by dask
+
+    The elements are partitioned into chunks, and each chunk is computed by one task,
+    so that the overhead of the task graph does not dwarf cheap functions.
+
+    If a client of `dask.distributed` is provided, the tasks run on its cluster,
+    and the shared data is scattered to the workers once, instead of being sent with every task.
+    The shared data belongs to the map, and `shared` gets it only in the tasks of the map.
+
+    Example:
+        from dask.distributed import Client, LocalCluster
+        client = Client(LocalCluster(n_workers=8))
+        pop.map = DaskMap(client=client, shared={'X': X})
+        pop.evolve()
+
+        # in the fitness function
+        X = shared('X')
+    """
+
+    def __init__(self, type_=None, chunksize=None, n_chunks=None, client=None, shared=None, scheduler=None):
+        """
+        Args:
+            type_ (optional): the type of the output
+            chunksize (int, optional): the number of elements in one task
+            n_chunks (int, optional): the number of tasks (the number of threads of the client,
+                or the number of CPUs by default), ignored if `chunksize` is given
+            client (dask.distributed.Client, optional): the client of a cluster
+            shared (dict, optional): read-only data used by the function, see `shared`
+            scheduler (str, optional): the scheduler of `dask.compute`, when no client is given
+        """
+
+        self.type_ = type_
+        self.chunksize = chunksize
+        self.n_chunks = n_chunks
+        self.client = client
+        self.shared = shared or {}
+        self.scheduler = scheduler
+        self._scattered = None
+
+    def _split(self, obj):
+        if self.chunksize:
+            chunksize = self.chunksize
+        else:
+            if self.n_chunks:
+                n_chunks = self.n_chunks
+            elif self.client is not None:
+                n_chunks = sum(self.client.nthreads().values())
+            else:
+                n_chunks = os.cpu_count()
+            chunksize = max(1, ceil(len(obj) / n_chunks))
+        return [obj[k:k+chunksize] for k in range(0, len(obj), chunksize)]
+
+    def __call__(self, f, obj, type_=None):
+        chunks = self._split(list(obj))
+        if self.client is None:
+            from dask import compute, delayed
+            data = delayed(self.shared, traverse=False) if self.shared else None
+            results = compute(*(delayed(_map_chunk)(f, chunk, data) for chunk in chunks),
+                scheduler=self.scheduler)
+        else:
+            if self.shared and self._scattered is None:
+                self._scattered = self.client.scatter([self.shared], broadcast=True)[0]
+            futures = self.client.map(_map_chunk, [f] * len(chunks), chunks,
+                data=self._scattered, pure=False)
+            results = self.client.gather(futures)
+        results = tuple(r for chunk in results for r in chunk)
+        type_ = type_ or self.type_
+        if type_ is None:
+            return results
+        else:
+            return type_(results)
 
 
 class DaskApply:
-    # The parallel version of the method `apply` by dask
+    # The parallel version of the method `apply` by dask, see `DaskMap` for the arguments
 
-    def __init__(self, type_=None):
+    def __init__(self, type_=None, **kwargs):
         self.type_ = type_
+        self.map = DaskMap(**kwargs)
 
     def __get__(self, instance, owner):
         def _map(f, type_=None):
-            results = compute(*(delayed(f)(e) for e in instance))
-            type_ = type_ or self.type_
-            if type_ is None:
-                return results
-            else:
-                return type_(results)
+            return self.map(f, instance, type_=type_ or self.type_)
         return _map
 
 
-class DaskMap:
-    # The parallel version of the inbuilt function `map` by dask
-
-    def __init__(self, type_=None):
+class ProcessPoolMap:
+    """The multi-processing version of the inbuilt function `map`
+
+    The processes are started once and reused by the following calls,
+    until calling `close`. The elements are submitted in chunks,
+    and the results are collected in order.
+
+    The function and the elements should be picklable,
+    e.g. `attrgetter('fitness')` on individuals defined in a module.
+
+    Example:
+        pop.map = ProcessPoolMap(n_workers=8, shared={'X': X, 'Y': Y})
+        pop.evolve()  # the fitness is computed by the workers
+        pop.map.close()
+
+        # in the fitness function, get the data loaded once by each worker
+        X = shared('X')
+    """
+
+    def __init__(self, n_workers=None, chunksize=None, initializer=None, initargs=(), shared=None, type_=None):
+        """
+        Args:
+            n_workers (int, optional): the number of processes (the number of CPUs by default)
+            chunksize (int, optional): the number of elements in one task
+            initializer (function, optional): called by each worker when it starts
+            initargs (tuple, optional): the arguments of `initializer`
+            shared (dict, optional): read-only data loaded once by each worker, see `shared`
+            type_ (optional): the type of the output
+        """
+
+        self.n_workers = n_workers or os.cpu_count()
+        self.chunksize = chunksize
+        self.initializer = initializer
+        self.initargs = initargs
+        self.shared = shared or {}
         self.type_ = type_
+        self._executor = None
+        self._sharing = []
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers,
+                initializer=_init_worker, initargs=(self.shared, self.initializer, self.initargs))
+        return self._executor
 
     def __call__(self, f, obj, type_=None):
-        results = compute(*(delayed(f)(e) for e in obj))
+        obj = list(obj)
+        chunksize = self.chunksize or max(1, ceil(len(obj) / (4 * self.n_workers)))
+        results = self.executor.map(f, obj, chunksize=chunksize)
         type_ = type_ or self.type_
         if type_ is None:
             return results
         else:
             return type_(results)
 
+    def close(self):
+        # shut down the processes
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        # the shared data is also available in the main process in the block
+        self._sharing.append(sharing(self.shared))
+        self._sharing[-1].__enter__()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self._sharing.pop().__exit__(*args, **kwargs)
+        self.close()
+
+    def __getstate__(self):
+        # the processes are not pickled
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_sharing'] = []
+        return state
+
+
+class ProcessPoolApply:
+    # The multi-processing version of the method `apply`
+
+    def __init__(self, type_=None, map_=None, **kwargs):
+        self.type_ = type_
+        self.map = map_ or ProcessPoolMap(**kwargs)
+
+    def __get__(self, instance, owner):
+        def _map(f, type_=None):
+            return self.map(f, instance, type_=type_ or self.type_)
+        return _map
+
 
 def mt_apply(cls):
     cls.apply = MTApply(type_=list)
@@ -107,6 +355,27 @@ def dask_apply(cls):
     return cls
 
 
+def process_apply(cls=None, **kwargs):
+    """Let `apply` and `map` of the class run in a persistent process pool
+
+    Usage:
+        @process_apply
+        class MyPopulation(StandardPopulation): ...
+
+        @process_apply(n_workers=4, shared={'X': X})
+        class MyPopulation(StandardPopulation): ...
+    """
+
+    def _deco(cls):
+        cls.map = ProcessPoolMap(**kwargs)
+        cls.apply = ProcessPoolApply(type_=list, map_=cls.map)
+        return cls
+
+    if cls is None:
+        return _deco
+    return _deco(cls)
+
+
 if __name__ == '__main__':
     
     @dask_apply
@@ -8,7 +8,7 @@ StandardPopulation: Standard Genetic Algorithm
 HOFPopulation: Standard Genetic Algorithm with hall of fame
 """
 
-from operator import methodcaller, attrgetter
+from operator import methodcaller
 from random import gauss, random
 
 import numpy as np
@@ -19,6 +19,7 @@ from .chromosome import BinaryChromosome
 from .meta import MetaList
 
 from .deco import side_effect
+from .halloffame import HallOfFame
 
 
 class StandardPopulation(BasePopulation):
@@ -55,14 +56,17 @@ class HOFPopulation(BasePopulation):
         hall_of_fame (list): the copy of the best individuals
     """
 
-    params = {'hof_size': 2}
+    params = {'hof_size': 2, 'hof_dedup': False}
     alias ={'hof': 'hall_of_fame'}
     
     # hall_of_fame = []
 
     def init(self):
         super().init()
-        self.hall_of_fame = self.get_best_individuals(self.hof_size, copy=True)
+        f = self.get_all_fitness()
+        ks = np.argsort(f)[-self.hof_size:] if self.hof_size > 0 else []
+        self.hall_of_fame = HallOfFame([self[k].copy() for k in ks], fitness=np.asarray(f)[ks],
+            maxsize=self.hof_size, dedup=self.hof_dedup)
 
     def transition(self, *args, **kwargs):
         """
@@ -79,24 +83,22 @@ class HOFPopulation(BasePopulation):
         insert the best individuals of the population into the hall of fame;
         meanwhile, remove the worst ones in the hall of fame
         """
-        for ind in self:
-            for k in range(self.hof_size):
-                if self.hall_of_fame[-k-1].fitness < ind.fitness:
-                    self.hall_of_fame.insert(self.hof_size-k, ind.copy())
-                    self.hall_of_fame.pop(0)
-                    break
+
+        if not isinstance(self.hall_of_fame, HallOfFame):
+            self.hall_of_fame = HallOfFame(self.hall_of_fame, dedup=self.hof_dedup)
+        self.hall_of_fame.update(self.individuals, self.get_all_fitness())
 
     @property
     def max_fitness(self):
         if self.hall_of_fame:
-            return max(map(attrgetter('fitness'), self.hall_of_fame))
+            return self.hall_of_fame.max_fitness
         else:
             return super().max_fitness
 
     @property
     def best_individual(self):
         if self.hall_of_fame:
-            return self.hall_of_fame[np.argmax([_.fitness for _ in self.hall_of_fame])]
+            return self.hall_of_fame.best
         else:
             return super().best_individual
 
@@ -201,6 +203,7 @@ class ModifiedPopulation(StandardPopulation):
 
     params = {'mutate_prob_ub':0.5, 'mutate_prob_lb':0.1}
 
+    @side_effect
     def mutate(self):
         fm = self.max_fitness
         fa = self.mean_fitness
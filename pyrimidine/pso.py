@@ -7,16 +7,14 @@ Developed by J. Kennedy and R. Eberhart[Kennedy and Eberhart 2001]
 Each individual is represented by the position and the velocity.
 """
 
-from random import random
-from operator import attrgetter
-
 import numpy as np
 
 from .base import BaseIndividual
 from .chromosome import FloatChromosome
-from .mixin import PopulationMixin
+from .mixin import PopulationMixin, evaluate_batch, stack_rows, are_row_views
 from .meta import MetaContainer
-from .deco import basic_memory
+from .deco import basic_memory, side_effect
+from .halloffame import HallOfFame
 
 
 @basic_memory
@@ -59,6 +57,12 @@ class BaseParticle(BaseIndividual):
             return self.position
         return self.memory['solution']
 
+    def _fitness(self):
+        # `_fitness_batch` of particles gets the matrix of the positions
+        if hasattr(self.__class__, '_fitness_batch'):
+            return self._fitness_batch(np.asarray(self.position)[None])[0]
+        return super()._fitness()
+
     def update_vilocity(self, fame=None, *args, **kwargs):
         raise NotImplementedError
 
@@ -118,8 +122,23 @@ class Particle(BaseParticle):
                         + acceleration_coefficient * scale_fame * (fame.best_position-self.position))
 
 
+def _set_memories(particles, best_positions, fitness):
+    # restore the memories of the particles
+    for particle, x, f in zip(particles, best_positions, fitness):
+        particle.set_memory(fitness=f, solution=particle.position.__class__(x))
+
+
 class ParticleSwarm(PopulationMixin, metaclass=MetaContainer):
     """Standard PSO
+
+    The states of the particles are stacked into the matrices (of shape (n, d)):
+    `positions`, `velocities`, `best_positions`, and the vector `best_fitness_values`,
+    which are updated in a vectorized way in `transition`.
+    The position and the velocity of each particle are views of the rows of the matrices,
+    so the particles are always up to date.
+
+    If the particles define the classmethod `_fitness_batch`,
+    the matrix of the positions is evaluated in one call.
     
     Extends:
         PopulationMixin
@@ -139,58 +158,117 @@ class ParticleSwarm(PopulationMixin, metaclass=MetaContainer):
     'get_best_particles': 'get_best_elements'
     }
 
+    positions = None
+
     def init(self):
         super().init()
-        self.hall_of_fame = self.get_best_particles(self.hof_size, copy=True)
-    
+        self._stack()
+        self.hall_of_fame = HallOfFame(self.get_best_particles(self.hof_size, copy=True))
+
+    def _stack(self):
+        # stack the states of the particles, and let the particles hold the views of the rows
+        self.positions, xs = stack_rows(particle.position for particle in self)
+        self.velocities, vs = stack_rows(particle.velocity for particle in self)
+        self.best_positions = np.array([particle.best_position for particle in self], dtype=float)
+        self.best_fitness_values = np.array([particle.fitness for particle in self], dtype=float)
+        for particle, x, v in zip(self, xs, vs):
+            particle.chromosomes[0] = x
+            particle.chromosomes[1] = v
+
+    def _is_stacked(self):
+        # check whether the k-th particle still holds the views of the k-th rows of the matrices
+        return are_row_views((particle.position for particle in self), self.positions)
+
+    def get_state(self):
+        # the memories (best positions) of the particles and the fames are saved with the genomes,
+        # the positions and the velocities, and the fitness of the memories
+        state = super().get_state()
+        state['best_positions'] = [np.array(particle.best_position) for particle in self]
+        if 'hall_of_fame' in state:
+            state['hall_of_fame']['best_positions'] = [np.array(particle.best_position) for particle in self.hall_of_fame]
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        _set_memories(self, state['best_positions'], state['fitness'])
+        if 'best_positions' in state.get('hall_of_fame', {}):
+            hof = self.hall_of_fame
+            _set_memories(hof, state['hall_of_fame']['best_positions'], hof.fitness_values)
+        self._stack()
+
     def update_hall_of_fame(self):
-        hof_size = len(self.hall_of_fame)
-        for ind in self:
-            for k in range(hof_size):
-                if self.hall_of_fame[-k-1].fitness < ind.fitness:
-                    self.hall_of_fame.insert(hof_size-k, ind.copy())
-                    self.hall_of_fame.pop(0)
-                    break
+        if not isinstance(self.hall_of_fame, HallOfFame):
+            self.hall_of_fame = HallOfFame(self.hall_of_fame)
+        fitness = self.best_fitness_values if self._is_stacked() else self.get_all_fitness()
+        self.hall_of_fame.update(self.particles, fitness)
 
     @property
     def best_fitness(self):
         if self.hall_of_fame:
-            return max(map(attrgetter('fitness'), self.hall_of_fame))
+            return self.hall_of_fame.max_fitness
         else:
             return super().best_fitness
 
+    @property
+    def max_fitness(self):
+        if self.hall_of_fame:
+            return self.hall_of_fame.max_fitness
+        else:
+            return super().max_fitness
+
     def transition(self, *args, **kwargs):
         """
         Transitation of the states of particles
         """
+        if not self._is_stacked():
+            self._stack()
         self.move()
         self.backup()
         self.update_hall_of_fame()
 
+    def _get_fitness(self, elements):
+        # the fitness of a particle is the fitness of its best position
+        return [particle.fitness for particle in elements]
+
+    def evaluate(self):
+        # the fitness of the current positions of the particles
+        if hasattr(self.element_class, '_fitness_batch'):
+            return evaluate_batch(self.element_class, self.positions, self.positions)
+        return np.array([particle._evaluate() for particle in self], dtype=float)
+
+    @side_effect
     def backup(self):
         # overwrite the memory of the particle if its current state is better its memory
-        for particle in self:
-            particle.backup()
+        fitness = self.evaluate()
+        ks = np.flatnonzero(fitness > self.best_fitness_values)
+        self.best_positions[ks] = self.positions[ks]
+        self.best_fitness_values[ks] = fitness[ks]
+        for k in ks:
+            particle = self[k]
+            particle.set_memory(fitness=fitness[k], solution=particle.position.copy())
 
     def move(self):
         """Move the particles
 
-        Define the moving rule of particles, according to the hall of fame and the best record
+        Each particle is attracted by its best position, and by the worst fame better than it
+        (the best particles are only attracted by their best positions).
+        The velocities are clamped by `max_velocity` if it is set.
         """
 
-        scale = random()
-        eta = random()
-        scale_fame = random()
-        for particle in self:
-            for fame in self.hall_of_fame:
-                if particle.fitness < fame.fitness:
-                    particle.update_vilocity_by_fame(fame, scale, scale_fame, 
-                        self.inertia, self.learning_factor, self.acceleration_coefficient)
-                    particle.position = particle.position + particle.velocity
-                    break
-        for particle in self.hall_of_fame:
-            particle.update_vilocity(scale, self.inertia, self.learning_factor)
-            particle.position = particle.position + particle.velocity
+        X, V = self.positions, self.velocities
+        r1 = np.random.random(X.shape)
+        r2 = np.random.random(X.shape)
+        V *= self.inertia
+        V += self.learning_factor * r1 * (self.best_positions - X)
+        hof = self.hall_of_fame
+        ks = np.searchsorted(hof.fitness_values, self.best_fitness_values, side='right')
+        social = ks < len(hof)
+        if np.any(social):
+            fame = np.array([particle.best_position for particle in hof], dtype=float)
+            V[social] += self.acceleration_coefficient * r2[social] * (fame[ks[social]] - X[social])
+        if self.max_velocity is not None:
+            np.clip(V, -self.max_velocity, self.max_velocity, out=V)
+        X += V
 
 
 class DiscreteParticleSwarm(ParticleSwarm):
@@ -12,7 +12,7 @@ from .chromosome import FloatChromosome
 from .population import HOFPopulation
 from random import random
 
-from .deco import basic_memory
+from .deco import basic_memory, side_effect
 from .utils import randint2
 
 
@@ -68,6 +68,7 @@ class SlimeMould(HOFPopulation):
             else:
                 sm.approach_food(fame, direction, p, vb, vc)
     
+    @side_effect
     def transition(self, t):
 
         self.approach_food(t)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+
+import numpy as np
+
+from pyrimidine import MonoIndividual, BinaryChromosome, FloatChromosome
+from pyrimidine.arraypopulation import ArrayPopulation, MemmapPopulation
+
+import pytest
+
+
+@pytest.fixture
+def example_population(example_problem):
+    _evaluate = example_problem
+    return ArrayPopulation[(BinaryChromosome // 10).set_fitness(_evaluate)] // 8
+
+
+class TestArrayPopulation:
+
+    def test_random(self, example_population):
+        p = example_population.random()
+        assert p.genomes.shape == (8, 10) and len(p) == 8
+        assert isinstance(p[0], BinaryChromosome)
+        assert np.shares_memory(p[0], p.genomes)
+
+    def test_individual(self):
+        class _Individual(MonoIndividual[BinaryChromosome // 10]):
+            def _fitness(self):
+                return sum(self.chromosome)
+
+        p = (ArrayPopulation[_Individual] // 8).random()
+        assert isinstance(p[0], _Individual)
+        assert np.all(p.get_all_fitness() == p.genomes.sum(axis=1))
+
+    def test_fitness_cache(self, example_population):
+        p = example_population.random()
+        f = p.get_all_fitness().copy()
+        p.genomes[:] = 0
+        assert np.all(p.get_all_fitness() == f)
+        p.clear_cache()
+        assert np.all(p.get_all_fitness() == p[0].fitness)
+
+    def test_select(self, example_population):
+        np.random.seed(0)
+        p = example_population.random(n_individuals=20)
+        f = p.get_all_fitness().copy()
+        p.select(n_sel=10)
+        assert len(p) == 10
+        assert len(np.unique(p.genomes, axis=0)) <= 10
+        assert p.max_fitness == f.max() == max(c.fitness for c in p)
+
+    def test_mate_mutate(self, example_population):
+        p = example_population.random()
+        offspring = p.mate(mate_prob=1)
+        assert len(p) == 15 and offspring.shape == (7, 10)
+        p.mutate(mutate_prob=1)
+        assert np.all(np.isin(p.genomes, (0, 1)))
+
+    def test_best(self, example_population):
+        p = example_population.random()
+        bests = p.get_best_individuals(3)
+        f = np.sort(p.get_all_fitness())
+        assert [b.fitness for b in bests] == list(f[-3:])
+
+    def test_evolve(self, example_population):
+        p = example_population.random()
+        data = p.evolve(n_iter=3, history=True)
+        assert len(data) == 4 and len(p) >= p.default_size
+
+    def test_float(self):
+        P = ArrayPopulation[(FloatChromosome // 5).set_fitness(lambda x: -np.sum(x**2))] // 10
+        p = P.random()
+        p.evolve(n_iter=2)
+        assert p.genomes.dtype == np.float64
+
+    def test_fitness_batch(self, example_problem):
+        _evaluate = example_problem
+        calls = []
+
+        class _Chromosome(BinaryChromosome // 10):
+
+            @classmethod
+            def _fitness_batch(cls, genomes):
+                calls.append(len(genomes))
+                return _evaluate(genomes)
+
+        p = (ArrayPopulation[_Chromosome] // 8).random()
+        p.evolve(n_iter=2)
+        assert all(n > 1 for n in calls)
+        assert p[0].fitness == _evaluate(p.genomes[0])
+
+    def test_async_fitness(self):
+        import asyncio
+
+        class _Chromosome(BinaryChromosome // 6):
+
+            async def _fitness(self):
+                await asyncio.sleep(0)
+                return np.sum(self)
+
+        p = (ArrayPopulation[_Chromosome] // 10).random()
+        assert np.all(p.get_all_fitness() == p.genomes.sum(axis=1))
+        asyncio.run(p.aezolve(n_iter=2))
+        assert np.all(p.get_all_fitness() == p.genomes.sum(axis=1))
+
+    def test_crossover(self):
+        class _Population(ArrayPopulation):
+            element_class = FloatChromosome // 5
+            default_size = 10
+            params = {'crossover': 'sbx'}
+
+        p = _Population.random()
+        offspring = p.mate(mate_prob=1)
+        assert offspring.shape == (9, 5) and len(p) == 19
+        p.mate(crossover='blend')
+
+        # the parameters of the crossover method are passed from `params` or the arguments
+        _Population.random().mate(eta=5)
+        p = _Population.random()
+        p.crossover_params = {'alpha': 0}
+        offspring = p.mate(mate_prob=1, crossover='blend')
+        lo, hi = np.minimum(p.genomes[:9], p.genomes[1:10]), np.maximum(p.genomes[:9], p.genomes[1:10])
+        assert np.all((lo <= offspring) & (offspring <= hi))
+
+        class _BinaryPopulation(ArrayPopulation):
+            element_class = BinaryChromosome // 5
+            params = {'crossover': 'sbx'}
+
+        with pytest.raises(TypeError):
+            _BinaryPopulation.random().mate()
+
+
+class TestMemmapPopulation:
+
+    def test_memmap(self, tmp_path):
+
+        class _Chromosome(FloatChromosome // 6):
+
+            @classmethod
+            def _fitness_batch(cls, genomes):
+                assert len(genomes) <= 16
+                return -np.sum(genomes ** 2, axis=1)
+
+        class _Population(MemmapPopulation):
+            element_class = _Chromosome
+            default_size = 40
+            params = {'block_size': 16}
+
+        p = _Population.random(filename=tmp_path / 'genomes.dat')
+        assert isinstance(p.genomes, np.memmap) and p.genomes.shape == (40, 6)
+        assert isinstance(p[0], _Chromosome) and np.shares_memory(p[0], p.genomes)
+        f = p.get_all_fitness()
+        assert np.allclose(f, -np.sum(p.genomes ** 2, axis=1))
+
+        p.evolve(n_iter=3)
+        assert len(p) >= p.default_size and p.genomes.shape[1] == 6
+        assert np.allclose(p.get_all_fitness(), -np.sum(p.genomes ** 2, axis=1))
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['genomes.dat']
+
+        q = p.copy()
+        assert q.filename != p.filename and np.all(q.genomes == p.genomes)
@@ -31,3 +31,81 @@ class TestChromosome:
         q.measure()
         assert q.measure_result.dtype == np.int_
 
+
+    def test_packed(self):
+        C = PackedBinaryChromosome // 20
+        b = C.random()
+        assert len(b) == 20 and b.nbytes == 3
+        assert all(bi in {0, 1} for bi in b)
+        assert b.popcount() == np.sum(b) == np.asarray(b).sum()
+
+        b1, b2 = C.random(), C.random()
+        c = b1.cross(b2)
+        assert isinstance(c, C) and c[0] == b1[0] and c[-1] == b2[-1]
+        assert b1.hamming(b2) == np.sum(np.asarray(b1) != np.asarray(b2))
+
+        d = b.dual()
+        assert d.popcount() == 20 - b.popcount() and np.all(np.asarray(d) == 1 - np.asarray(b))
+
+        cpy = b.copy()
+        b.mutate(indep_prob=1)
+        assert b.equal_to(d) and b.hamming(cpy) == 20
+        b[0] = 1 - b[0]
+        assert b.hamming(cpy) == 19
+
+        # the words of the caller are not changed
+        words = np.full(3, 0xFF, dtype=np.uint8)
+        assert C(words, n_bits=20, packed=True).popcount() == 20 and np.all(words == 0xFF)
+
+        # the flips are drawn at distinct positions, and the padding bits are kept 0
+        D = PackedBinaryChromosome // 10004
+        b = D.zero()
+        b.mutate(indep_prob=0.01)
+        assert 0 < b.popcount() < 300 and b.words[-1] & 0x0F == 0
+        b = D.zero()
+        b.mutate(indep_prob=0.9)
+        assert 8500 < b.popcount() < 9500
+
+    def test_mutate_mask(self):
+        m = FloatMatrixChromosome(np.zeros((4, 5)))
+        m.mutate(indep_prob=1)
+        assert m.shape == (4, 5) and np.all(m != 0)
+
+        class _ListChromosome(ListChromosome):
+
+            @classmethod
+            def random(cls):
+                return cls([1] * 6)
+
+        c = _ListChromosome([0] * 6)
+        c.mutate(indep_prob=0)
+        assert c == [0] * 6
+        c.mutate(indep_prob=1)
+        assert isinstance(c, _ListChromosome) and c == [1] * 6
+
+        class _ArrayChromosome(ArrayChromosome):
+
+            @classmethod
+            def random(cls):
+                return cls([1.0] * 6)
+
+        a = _ArrayChromosome([0.0] * 6)
+        a.mutate(indep_prob=1)
+        assert isinstance(a, _ArrayChromosome) and list(a) == [1.0] * 6
+
+    def test_mutate_genes(self):
+        # only the masked genes are sampled by the gene class, instead of a whole random chromosome
+
+        class _Gene(BaseGene):
+            values = ('a', 'b')
+
+        class _ListChromosome(ListChromosome):
+            element_class = _Gene
+
+            @classmethod
+            def random(cls):
+                raise NotImplementedError
+
+        c = _ListChromosome(['c'] * 6)
+        c.mutate(indep_prob=1)
+        assert len(c) == 6 and set(c) <= {'a', 'b'}
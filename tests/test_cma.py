@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+from pyrimidine import FloatChromosome
+from pyrimidine.individual import MonoIndividual
+from pyrimidine.cma import CMAEvolutionStrategy
+
+
+class _Chromosome(FloatChromosome // 8):
+
+    @classmethod
+    def _fitness_batch(cls, genomes):
+        return - np.sum((genomes - 0.5) ** 2, axis=1)
+
+
+class TestCMA:
+
+    def test_batch(self):
+
+        class _Population(CMAEvolutionStrategy):
+            element_class = _Chromosome
+
+        p = _Population.random()
+        # before `init`
+        assert p.max_fitness == np.max(p.get_all_fitness())
+        p.evolve(n_iter=150)
+        assert p.max_fitness > -1e-6 and np.allclose(p.solution, 0.5, atol=1e-3)
+        assert len(p) == p.popsize == 4 + int(3 * np.log(8))
+        assert np.allclose(p.C, p.C.T)
+
+    def test_individual(self):
+
+        class _Individual(MonoIndividual):
+            element_class = FloatChromosome // 4
+
+            def _fitness(self):
+                return - np.sum(np.abs(self.chromosome))
+
+        class _Population(CMAEvolutionStrategy):
+            element_class = _Individual
+            params = {'sigma': 0.5}
+
+        p = _Population.random()
+        data = p.evolve(n_iter=50, history=True)
+        assert data['Best Fitness'].is_monotonic_increasing
+        assert isinstance(p.best_element, _Individual)
+
+    def test_restart(self):
+
+        class _Population(CMAEvolutionStrategy):
+            element_class = _Chromosome
+            params = {'n_restarts': 2, 'tolfun': 1e-3}
+
+        p = _Population.random()
+        p.evolve(n_iter=300)
+        assert p.restarts == 2 and p.stopped
+        assert p.popsize == 4 * (4 + int(3 * np.log(8)))
+
+    def test_evaluations(self):
+        # the candidates are not evaluated again for the statistics
+        n_rows = [0]
+
+        class _C(_Chromosome):
+
+            @classmethod
+            def _fitness_batch(cls, genomes):
+                n_rows[0] += len(genomes)
+                return - np.sum((genomes - 0.5) ** 2, axis=1)
+
+        class _Population(CMAEvolutionStrategy):
+            element_class = _C
+            params = {'lambda_': 10}
+
+        _Population.random().evolve(n_iter=10, history=True)
+        assert n_rows[0] == 10 + 10 * 10
+
+    def test_checkpoint(self, tmp_path):
+        import random
+
+        class _Population(CMAEvolutionStrategy):
+            element_class = _Chromosome
+
+        np.random.seed(1); random.seed(1)
+        data = _Population.random().evolve(n_iter=30, history=True)
+
+        np.random.seed(1); random.seed(1)
+        path = tmp_path / 'cma.pkl'
+        counter = [0]
+        def control(o):
+            counter[0] += 1
+            return counter[0] == 23
+        _Population.random().evolve(n_iter=30, history=True, checkpoint=path, checkpoint_period=20, control=control)
+        np.random.seed(2); random.seed(2)
+        p, resumed = _Population.resume(path)
+        assert p.generation == 30 and p.n_evaluations == 10 + 30 * p.popsize
+        assert resumed.equals(data)
@@ -4,10 +4,11 @@
 from pyrimidine.individual import MonoIndividual
 from pyrimidine.population import HOFPopulation, BasePopulation
 from pyrimidine.chromosome import FloatChromosome
-from pyrimidine.de import DifferentialEvolution
+from pyrimidine.de import DifferentialEvolution, DifferentialEvolutionC, mutants, _distinct
 
 from pyrimidine.benchmarks.special import rosenbrock
 
+import numpy as np
 import pytest
 
 @pytest.fixture(scope="class")
@@ -48,3 +49,55 @@ class TestDE:
             'Mean Fitness' in data2.columns and 'Best Fitness' in data2.columns)
         assert len(data1) == len(data2) == 4
 
+
+    def test_distinct(self):
+        r = _distinct(6, 5)
+        assert all(len(set(row) | {i}) == 6 for i, row in enumerate(r))
+
+    def test_strategies(self):
+
+        class _Chromosome(FloatChromosome // 5):
+
+            @classmethod
+            def _fitness_batch(cls, genomes):
+                return - np.sum(genomes ** 2, axis=1)
+
+        for strategy in ('rand/1', 'best/1', 'current-to-best/1', 'rand/2'):
+            class _Population(DifferentialEvolutionC, BasePopulation):
+                element_class = _Chromosome
+                default_size = 20
+                params = {'strategy': strategy, 'dither': (0.5, 1)}
+
+            p = _Population.random()
+            p.init()
+            f0 = p.fitness_values.max()
+            p.evolve(n_iter=20, initialize=False)
+            assert p.fitness_values.max() >= f0
+            assert np.allclose(p.fitness_values, - np.sum(p.genomes ** 2, axis=1))
+            assert all(np.array_equal(c, g) for c, g in zip(p, p.genomes))
+
+        with pytest.raises(ValueError):
+            mutants(np.zeros((3, 2)), strategy='rand/1')
+
+    def test_fitness_values(self):
+
+        calls = [0]
+
+        class _Chromosome(FloatChromosome // 5):
+
+            @classmethod
+            def _fitness_batch(cls, genomes):
+                calls[0] += 1
+                return - np.sum(genomes ** 2, axis=1)
+
+        class _Population(DifferentialEvolutionC, BasePopulation):
+            element_class = _Chromosome
+            default_size = 10
+
+        p = _Population.random()
+        p.init()
+        calls[0] = 0
+        # the statistics read the fitness vector held by the population
+        p.evolve(n_iter=5, initialize=False)
+        assert calls[0] == 5
+        assert p.get_all_fitness() is p.fitness_values
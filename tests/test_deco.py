@@ -75,3 +75,55 @@ class TestDeco:
         i.backup()
         assert i._fitness() < i.fitness
 
+    def test_fitness_memo(self):
+        from pyrimidine.chromosome import BinaryChromosome
+
+        calls = []
+
+        @memoize_fitness(maxsize=2)
+        class C(BinaryChromosome // 4):
+            def _fitness(self):
+                calls.append(1)
+                return sum(self)
+
+        c = C([0, 1, 1, 0])
+        assert c.fitness == c.copy().fitness == 2
+        assert len(calls) == 1 and C._fitness_memo.hits == 1
+
+        C([1, 1, 1, 1]).fitness
+        C([0, 0, 0, 0]).fitness
+        assert len(C._fitness_memo) == 2
+        c.fitness
+        assert len(calls) == 4
+
+    def test_fitness_memo_subclass(self):
+        from pyrimidine.chromosome import BinaryChromosome
+
+        @memoize_fitness(maxsize=10)
+        class C(BinaryChromosome // 4):
+            def _fitness(self):
+                return sum(self)
+
+        class D(C):
+            def _fitness(self):
+                return - sum(self)
+
+        assert C([0, 1, 1, 0]).fitness == 2
+        assert D([0, 1, 1, 0]).fitness == -2
+        assert C._fitness_memo is not D._fitness_memo
+
+    def test_fitness_memo_reset(self):
+        from pyrimidine.chromosome import BinaryChromosome
+
+        @memoize_fitness(maxsize=10)
+        class C(BinaryChromosome // 4):
+            def _fitness(self):
+                return sum(self)
+
+        class D(C):
+            pass
+
+        assert C([0, 1, 1, 0]).fitness == D([0, 1, 1, 0]).fitness == 2
+        C.set_fitness(lambda c: 2 * sum(c))
+        assert C([0, 1, 1, 0]).fitness == D([0, 1, 1, 0]).fitness == 4
+
@@ -3,8 +3,10 @@
 # Test for Evolution Programming
 
 
-from pyrimidine import FloatChromosome, BasePopulation
-from pyrimidine.ep import BaseEPIndividual, EvolutionProgramming
+import numpy as np
+
+from pyrimidine import FloatChromosome, BinaryChromosome, BasePopulation
+from pyrimidine.ep import BaseEPIndividual, EvolutionProgramming, q_tournament
 from pyrimidine.benchmarks.special import rosenbrock
 
 
@@ -15,6 +17,7 @@ def evaluate(x):
 class TestEP:
 
     def test_ep(self):
+        n = 10
 
         class _Individual(BaseEPIndividual):
             element_class = FloatChromosome // n, FloatChromosome // n
@@ -23,7 +26,7 @@ class TestEP:
                 return self.chromosomes[0]
 
             def _fitness(self):
-                return _evaluate(self.decode())
+                return evaluate(self.decode())
 
 
         class _Population(EvolutionProgramming, BasePopulation):
@@ -36,4 +39,63 @@ class TestEP:
         pop.transition()
         
         assert isinstance(pop, _Population)
+        assert len(pop) == 20 and pop._is_stacked()
+        pop.evolve(n_iter=5, initialize=False)
+        assert np.allclose(pop.fitness_values, [evaluate(x) for x in pop.genomes])
+        assert np.all(pop.variances >= pop[0].epsilon)
+
+    def test_stale_fitness(self):
+        n = 10
+
+        class _Individual(BaseEPIndividual):
+            element_class = FloatChromosome // n, FloatChromosome // n
+
+            def _fitness(self):
+                return evaluate(self.decode())
+
+        class _Population(EvolutionProgramming, BasePopulation):
+            element_class = _Individual
+            default_size = 20
+
+        pop = _Population.random()
+        pop.init()
+        pop.mutate(mutate_prob=1)
+        assert pop._is_stacked()
+        assert np.allclose(pop.fitness_values, [e.fitness for e in pop])
+        assert np.allclose(pop.fitness_values, [evaluate(x) for x in pop.genomes])
 
+        # the selection keeps the matrices in sync with the individuals
+        pop.select(10)
+        assert len(pop) == len(pop.genomes) == 10 and pop._is_stacked()
+        assert np.allclose(pop.fitness_values, [evaluate(x) for x in pop.genomes])
+
+    def test_custom_mutate(self):
+        n = 10
+
+        class _Individual(BaseEPIndividual):
+            element_class = BinaryChromosome // n, FloatChromosome // n
+
+            def decode(self):
+                return self.chromosomes[0]
+
+            def _fitness(self):
+                return np.sum(self.decode())
+
+            def mutate(self):
+                # flip the bits with the proba. given by the variance
+                b = np.random.random(n) < self.variance
+                self.chromosomes[0] = self.chromosomes[0] * (1 - b) + (1 - self.chromosomes[0]) * b
+
+        class _Population(EvolutionProgramming, BasePopulation):
+            element_class = _Individual
+            default_size = 10
+
+        pop = _Population.random()
+        pop.evolve(n_iter=5)
+        assert len(pop) == 10
+        assert all(isinstance(i.decode(), BinaryChromosome) and np.all((i.decode() == 0) | (i.decode() == 1)) for i in pop)
+
+    def test_q_tournament(self):
+        fitness = np.arange(40.)
+        ks = q_tournament(fitness, 10, q=40)
+        assert len(set(ks)) == 10 and np.mean(ks) > 20
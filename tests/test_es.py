@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pytest
+
+from pyrimidine import FloatChromosome
+from pyrimidine.es import EvolutionStrategy
+
+
+class _Chromosome(FloatChromosome // 6):
+
+    @classmethod
+    def _fitness_batch(cls, genomes):
+        return - np.sum(genomes ** 2, axis=1)
+
+
+class TestES:
+
+    @pytest.mark.parametrize('mode', ['plus', 'comma'])
+    def test_es(self, mode):
+
+        class _Population(EvolutionStrategy):
+            element_class = _Chromosome
+            default_size = 10
+            params = {'mu': 5, 'lambda_': 50, 'mode': mode}
+
+        p = _Population.random()
+        p.init()
+        f0 = p.fitness_values.max()
+        p.evolve(n_iter=10, initialize=False)
+        assert len(p) == len(p.sigmas) == 5 and p._is_stacked()
+        assert np.allclose(p.fitness_values, - np.sum(p.genomes ** 2, axis=1))
+        if mode == 'plus':
+            assert p.fitness_values.max() >= f0
+        assert len(p.mate()) == 50
+
+    def test_select(self):
+
+        class _C(FloatChromosome // 4):
+
+            def _fitness(self):
+                return np.sum(self)
+
+        class _Population(EvolutionStrategy):
+            element_class = _C
+            default_size = 10
+
+        p = _Population.random()
+        f = sorted(p.get_all_fitness())
+        p.select_best_individuals(3)
+        assert sorted(p.get_all_fitness()) == f[-3:]
+        # all the individuals are kept, if there are less than mu individuals
+        p.select_best_individuals(5)
+        assert sorted(p.get_all_fitness()) == f[-3:]
+
+    def test_evaluations(self):
+        # the survivors are not evaluated again for the statistics
+        n_rows = [0]
+
+        class _C(_Chromosome):
+
+            @classmethod
+            def _fitness_batch(cls, genomes):
+                n_rows[0] += len(genomes)
+                return - np.sum(genomes ** 2, axis=1)
+
+        class _Population(EvolutionStrategy):
+            element_class = _C
+            default_size = 10
+            params = {'mu': 10, 'lambda_': 10}
+
+        _Population.random().evolve(n_iter=10, history=True)
+        assert n_rows[0] == 10 + 10 * 10
+
+    def test_checkpoint(self, tmp_path):
+        import random
+
+        class _Population(EvolutionStrategy):
+            element_class = _Chromosome
+            default_size = 10
+            params = {'mu': 5, 'lambda_': 20}
+
+        np.random.seed(1); random.seed(1)
+        data = _Population.random().evolve(n_iter=20, history=True)
+
+        np.random.seed(1); random.seed(1)
+        path = tmp_path / 'es.pkl'
+        counter = [0]
+        def control(o):
+            counter[0] += 1
+            return counter[0] == 13
+        _Population.random().evolve(n_iter=20, history=True, checkpoint=path, checkpoint_period=10, control=control)
+        np.random.seed(2); random.seed(2)
+        p, resumed = _Population.resume(path)
+        assert p._is_stacked() and len(p.sigmas) == 5
+        assert resumed.equals(data)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+from pyrimidine import FloatChromosome
+from pyrimidine.fa import Firefly, StandardFireflies, compute_moves, attractiveness
+
+
+class TestFA:
+
+    def test_moves(self):
+        X = np.random.random((25, 3))
+        f = np.random.random(25)
+
+        def _moves(X):
+            D = np.zeros_like(X)
+            for i in range(25):
+                for j in range(25):
+                    if f[j] > f[i]:
+                        D[i] += 2 * attractiveness(np.linalg.norm(X[j] - X[i]), 0.5) * (X[j] - X[i])
+            return D
+
+        D = _moves(X)
+        assert np.allclose(compute_moves(X, f, beta=2, gamma=0.5), D)
+        assert np.allclose(compute_moves(X, f, beta=2, gamma=0.5, max_memory=16 * 25 * 4), D)
+        # the close fireflies far from the origin
+        Y = 1e4 + X * 1e-3
+        assert np.allclose(compute_moves(Y, f, beta=2, gamma=0.5), _moves(Y), rtol=1e-6, atol=0)
+
+    def test_fireflies(self):
+
+        class _Firefly(Firefly):
+            element_class = FloatChromosome // 5
+
+            @classmethod
+            def _fitness_batch(cls, positions):
+                return - np.sum(positions ** 2, axis=1)
+
+        class _Fireflies(StandardFireflies):
+            element_class = _Firefly
+            default_size = 30
+
+        pop = _Fireflies.random()
+        pop.init()
+        f0 = pop.max_fitness
+        pop.evolve(n_iter=10, initialize=False)
+        assert pop.max_fitness >= f0
+        assert np.allclose(pop.brightness, - np.sum(pop.positions ** 2, axis=1))
+        assert all(np.array_equal(f.position, x) for f, x in zip(pop.fireflies, pop.positions))
+        assert np.allclose(pop.get_all_fitness(), pop.best_fitness_values)
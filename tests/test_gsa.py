@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+from pyrimidine import BasePopulation
+from pyrimidine.gsa import Particle, GravitySearch, compute_accelerations
+
+
+class TestGSA:
+
+    def test_accelerations(self):
+        X = np.random.random((30, 5))
+        m = np.random.random(30)
+        np.random.seed(0)
+        A = compute_accelerations(X, m, gravity_coefficient=2)
+
+        # the dense formula with the same random factors
+        np.random.seed(0)
+        W = 2 * np.random.random((30, 30)) * m
+        R = np.linalg.norm(X[None, :, :] - X[:, None, :], axis=2)
+        np.fill_diagonal(W, 0)
+        W /= R ** 3 + 1e-12
+        assert np.allclose(A, np.einsum('ij,ijd->id', W, X[None, :, :] - X[:, None, :]))
+
+        # in blocks of rows
+        np.random.seed(0)
+        assert np.allclose(A, compute_accelerations(X, m, gravity_coefficient=2, max_memory=8 * 30 * 7 * 4))
+
+        # Kbest: the dense formula with the 3 heaviest particles as the attractors
+        np.random.seed(0)
+        B = compute_accelerations(X, m, n_best=3)
+        ks = np.sort(np.argsort(m)[-3:])
+        np.random.seed(0)
+        W = np.random.random((30, 3)) * m[ks]
+        D = X[None, ks, :] - X[:, None, :]
+        W[np.arange(30)[:, None] == ks] = 0
+        W /= np.linalg.norm(D, axis=2) ** 3 + 1e-12
+        assert np.allclose(B, np.einsum('ij,ijd->id', W, D))
+
+    def test_gsa(self):
+
+        class _Particle(Particle):
+            default_size = 8
+
+            def _fitness(self):
+                return - np.sum(self.position ** 2)
+
+        class MyGravitySearch(GravitySearch, BasePopulation):
+            element_class = _Particle
+            default_size = 20
+            params = {'n_best': 0.25}
+
+        pop = MyGravitySearch.random()
+        pop.evolve(n_iter=3)
+        assert all(p.accelerate.shape == p.position.shape for p in pop)
@@ -1,11 +1,23 @@
 #!/usr/bin/env python3
 
-from random import randint
+from random import randint, random, seed
+
+import numpy as np
 
 from pyrimidine import IterativeMixin, CollectiveMixin
 from pyrimidine import MetaContainer
 
 
+class RandomWalk(IterativeMixin):
+    # defined at the top level to be pickled
+
+    def __init__(self):
+        self.x = 0
+
+    def transition(self, *args, **kwargs):
+        self.x += np.random.random() - random()
+
+
 class TestMixin:
     
     def test_iterative(self):
@@ -53,4 +65,65 @@ class TestMixin:
         assert isinstance(game.players[0], Player)
         # game_ = Game.load(filename='model.pkl')
         # assert all(p.strategy == p_.strategy for p, p_ in zip(game, game_))
-            
\ No newline at end of file
+            
+    def test_history(self, tmp_path):
+        from pyrimidine.history import History
+
+        class Counter(IterativeMixin):
+
+            def __init__(self):
+                self.count = 0
+
+            def transition(self, *args, **kwargs):
+                self.count += 1
+
+        stat = {'count': lambda o: o.count, 'half': lambda o: o.count / 2}
+        data = Counter().evolve(n_iter=100, stat=stat, history=True)
+        assert list(data['count']) == list(range(101))
+
+        data = Counter().evolve(n_iter=5, stat=stat, history=data)
+        assert len(data) == 106
+
+        history = History()
+        history.append({'x': 0})
+        history.append({'x': 0.5})
+        assert list(history.to_frame()['x']) == [0, 0.5]
+
+        for suffix in ('.csv', '.jsonl'):
+            history = History(sink=tmp_path / f'history{suffix}', chunksize=7)
+            history = Counter().evolve(n_iter=20, stat=stat, history=history)
+            data = history.to_frame()
+            assert list(data['count']) == list(range(21)) and list(data['half']) == [k / 2 for k in range(21)]
+
+    def test_checkpoint(self, tmp_path):
+        stat = {'x': lambda o: o.x}
+        np.random.seed(1); seed(1)
+        data = RandomWalk().evolve(n_iter=20, stat=stat, history=True)
+
+        # interrupted after the checkpoint at the 10th iteration
+        np.random.seed(1); seed(1)
+        path = tmp_path / 'walk.pkl.gz'
+        RandomWalk().evolve(n_iter=20, stat=stat, history=True,
+            checkpoint=path, checkpoint_period=10, control=lambda o: o.x == data['x'][13])
+        np.random.seed(2); seed(2)
+        walk, resumed = RandomWalk.resume(path, stat=stat)
+        assert walk.x == data['x'].iloc[-1]
+        assert resumed.equals(data)
+
+        # the rows of the sink written before the checkpoint are kept, and those after it are dropped
+        from pyrimidine.history import History
+        from pyrimidine.mixin import _load
+        for suffix in ('.csv', '.jsonl'):
+            sink = tmp_path / f'walk{suffix}'
+            np.random.seed(1); seed(1)
+            RandomWalk().evolve(n_iter=20, stat=stat, history=History(sink=sink, chunksize=3),
+                checkpoint=path, checkpoint_period=10, control=lambda o: o.x == data['x'][13])
+            size = sink.stat().st_size
+            assert len(_load(path)['history']) == 11 and sink.stat().st_size == size
+            np.random.seed(2); seed(2)
+            _, history = RandomWalk.resume(path, stat=stat)
+            frame = history.to_frame()
+            assert len(frame) == 21 and np.allclose(frame['x'], data['x'])
+
+        walk.save(tmp_path / 'walk')
+        assert RandomWalk.load(tmp_path / 'walk').x == walk.x
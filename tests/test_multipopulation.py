@@ -1,14 +1,47 @@
 #!/usr/bin/env python3
 
 
-from pyrimidine.multipopulation import MultiPopulation
-from pyrimidine.population import StandardPopulation
+from pyrimidine.multipopulation import MultiPopulation, DualPopulation
+from pyrimidine.population import StandardPopulation, HOFPopulation
 from pyrimidine.individual import MonoIndividual
 from pyrimidine.chromosome import BinaryChromosome
 
 import pytest
 
 
+# the islands are pickled, so the classes are defined at the top level
+class _IslandChromosome(BinaryChromosome // 10):
+    pass
+
+
+class _IslandIndividual(MonoIndividual):
+
+    element_class = _IslandChromosome
+
+    def _fitness(self):
+        return sum(self.chromosome)
+
+
+class _IslandPopulation(StandardPopulation):
+    element_class = _IslandIndividual
+    default_size = 10
+
+
+class _IslandModel(MultiPopulation):
+    element_class = _IslandPopulation
+    default_size = 3
+
+
+class _HOFIslandPopulation(HOFPopulation):
+    element_class = _IslandIndividual
+    default_size = 10
+
+
+class _HOFIslandModel(MultiPopulation):
+    element_class = _HOFIslandPopulation
+    default_size = 2
+
+
 @pytest.fixture
 def example_population():
     class _Individual(MonoIndividual[BinaryChromosome // 10]):
@@ -51,3 +84,24 @@ class TestPopultion:
         pp = p.clone()
         assert isinstance(pp[0], StandardPopulation) and isinstance(pp[1], StandardPopulation)
 
+    def test_dual(self, example_population):
+        class _DualPopulation(DualPopulation):
+            element_class = example_population.element_class
+            default_size = 2
+
+        p = _DualPopulation.random()
+        p.mate()
+        assert len(p.males) + len(p.females) > 20
+
+    def test_evolve_islands(self):
+        p = _IslandModel.random()
+        for topology in ('ring', 'full', 'random'):
+            p = p.evolve_islands(n_iter=5, interval=2, topology=topology, n_migrants=2)
+            assert isinstance(p, _IslandModel) and len(p) == 3
+            assert all(isinstance(pop, _IslandPopulation) and len(pop) >= pop.default_size for pop in p)
+
+    def test_evolve_hof_islands(self):
+        # the islands are initialized in the workers
+        p = _HOFIslandModel.random()
+        p = p.evolve_islands(n_iter=4, interval=2, n_migrants=1)
+        assert all(len(pop.hall_of_fame) > 0 for pop in p)
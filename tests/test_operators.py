@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+
+import numpy as np
+from pyrimidine.operators import *
+
+import pytest
+
+
+class TestSelection:
+
+    def test_tournament(self):
+        fitness = np.random.random(100)
+        ks = tournament(fitness, 60, tourn_size=5)
+        assert len(ks) == len(np.unique(ks)) == 60
+
+    def test_tournament_aspirants(self):
+        # the 5 aspirants are different, so the winner is one of the best two
+        fitness = np.arange(6.)
+        assert all(tournament(fitness, 1, tourn_size=5)[0] >= 4 for _ in range(50))
+        ks = tournament(np.random.random(1000), 100, tourn_size=20)
+        assert len(ks) == len(np.unique(ks)) == 100
+
+    def test_tournament_small(self):
+        fitness = np.array([3., 1., 2.])
+        assert list(tournament(fitness, 3, tourn_size=5)) == [0, 2, 1]
+
+    def test_tournament_with_replacement(self):
+        fitness = np.arange(10.)
+        ks = tournament_with_replacement(fitness, 20, tourn_size=10)
+        assert len(ks) == 20 and np.all(fitness[ks] >= 0)
+
+    def test_sus(self):
+        fitness = np.array([0., 1., 1., 2.])
+        ks = stochastic_universal_sampling(fitness, 4)
+        assert 0 not in ks and np.sum(ks == 3) == 2
+
+    def test_truncation(self):
+        fitness = np.array([3., 1., 2., 5.])
+        assert list(truncation(fitness, 2)) == [3, 0]
+
+    def test_select(self):
+        with pytest.raises(ValueError):
+            select(np.zeros(3), 2, selection='roulette')
+
+
+class TestCrossover:
+
+    def test_crossover(self):
+        genomes = np.vstack((np.zeros((5, 8)), np.ones((5, 8))))
+        pairs = np.column_stack((np.arange(5), np.arange(5, 10)))
+        for method in ('one_point', 'two_point', 'uniform'):
+            offspring = crossover(genomes, pairs, method)
+            assert offspring.shape == (5, 8) and np.all((offspring == 0) | (offspring == 1))
+        offspring = crossover(genomes, pairs, 'one_point')
+        assert np.all(offspring[:, 0] == 0) and np.all(offspring[:, -1] == 1)
+        for method in ('arithmetic', 'sbx'):
+            offspring = crossover(genomes, pairs, method)
+            assert offspring.shape == (5, 8)
+        offspring = crossover(genomes, pairs, 'blend', alpha=0)
+        assert np.all((0 <= offspring) & (offspring <= 1))
+        with pytest.raises(ValueError):
+            crossover(genomes, pairs, 'unknown')
+        with pytest.raises(TypeError):
+            crossover(genomes.astype(int), pairs, 'arithmetic')
+
+    def test_one_gene(self):
+        # there is no cut, so the offspring are the first parents
+        genomes = np.arange(4.).reshape(4, 1)
+        pairs = [[0, 1], [2, 3]]
+        for method in ('one_point', 'two_point'):
+            assert np.array_equal(crossover(genomes, pairs, method), [[0], [2]])
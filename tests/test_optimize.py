@@ -3,6 +3,9 @@
 
 from pyrimidine.population import StandardPopulation
 from pyrimidine.optimize import ga_minimize, de_minimize, ga_minimize_1d, Optimizer
+from pyrimidine.benchmarks.optimization import Knapsack
+
+import numpy as np
 
 
 def test_ga_minimize():
@@ -23,4 +26,12 @@ def test_de_minimize():
 def test_optimizer():
     optimizer = Optimizer(StandardPopulation)
     optimizer(lambda x:x[0]**2+x[1], (-1,1), (-1,1))
-    assert True
\ No newline at end of file
+    assert True
+
+
+def test_knapsack():
+    # the chromosomes shorter than the number of the goods are evaluated by the first goods
+    evaluate = Knapsack.random(20, W=0.99)
+    x = np.random.randint(2, size=(4, 10))
+    assert np.all(evaluate(x) == x @ evaluate.c[:10])
+    assert evaluate(x[0]) == evaluate(x)[0]
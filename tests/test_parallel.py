@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+
+from operator import attrgetter
+
+import numpy as np
+import pytest
+
+from pyrimidine import BinaryChromosome, StandardPopulation
+from pyrimidine.parallel import *
+
+
+def _scaled_sum(x):
+    return shared('scale') * sum(x)
+
+
+class _Chromosome(BinaryChromosome // 10):
+
+    def _fitness(self):
+        return _scaled_sum(self)
+
+
+class TestParallel:
+
+    def test_process_map(self):
+        with ProcessPoolMap(n_workers=2, shared={'scale': 2}) as pmap:
+            assert list(pmap(_scaled_sum, [[1, 2], [3, 4], [5]])) == [6, 14, 10]
+            assert pmap(abs, [-1, 2], type_=tuple) == (1, 2)
+            assert _scaled_sum([1, 2]) == 6
+        assert shared() == {}
+
+    def test_shared(self):
+        # the maps do not overwrite the data of each other
+        pmap = ProcessPoolMap(n_workers=1, shared={'scale': 2}, type_=list)
+        qmap = ProcessPoolMap(n_workers=1, shared={'scale': 3}, type_=list)
+        assert pmap(_scaled_sum, [[1], [2]]) == [2, 4]
+        assert qmap(_scaled_sum, [[1], [2]]) == [3, 6]
+        pmap.close()
+        qmap.close()
+        with sharing({'scale': 5}):
+            assert _scaled_sum([1, 2]) == 15
+        assert shared() == {}
+
+    def test_process_fitness(self):
+        pop = (StandardPopulation[_Chromosome] // 10).random()
+        with ProcessPoolMap(n_workers=2, type_=list, shared={'scale': 3}) as pop.map:
+            assert list(pop.get_all_fitness()) == [3 * sum(c) for c in pop]
+            pop.evolve(n_iter=2)
+
+    def test_thread_map(self):
+        tmap = MTMap(type_=list, n_workers=2)
+        assert tmap(abs, [-1, 2, -3]) == [1, 2, 3]
+        assert get_thread_pool(2) is get_thread_pool(2)
+
+        def _error(x):
+            raise ValueError(x)
+
+        with pytest.raises(ValueError):
+            tmap(_error, [1])
+
+    def test_nested_thread_map(self):
+        # the inner maps run in the threads of the outer map, instead of waiting for the busy pool
+        tmap = MTMap(type_=list, n_workers=2)
+        assert tmap(lambda x: sum(tmap(abs, [-x] * 3)), range(4)) == [0, 3, 6, 9]
+
+    def test_thread_apply(self):
+
+        @mt_apply
+        class C:
+            def __iter__(self):
+                return iter([1, 2, 3])
+
+        assert C().apply(lambda x: x + 1) == [2, 3, 4]
+
+    def test_dask_map(self):
+        dmap = DaskMap(chunksize=2, shared={'scale': 2})
+        assert dmap(_scaled_sum, [[1], [2], [3], [4], [5]]) == (2, 4, 6, 8, 10)
+        assert DaskMap(shared={'scale': 3})(_scaled_sum, [[1]]) == (3,)
+        assert dmap(_scaled_sum, [[1]]) == (2,) and shared() == {}
+
+        @dask_apply
+        class C:
+            def __iter__(self):
+                return iter([1, 2, 3])
+
+        assert C().apply(lambda x: x + 1) == [2, 3, 4]
+
+    def test_dask_client(self):
+        distributed = pytest.importorskip('dask.distributed')
+        with distributed.Client(processes=False, n_workers=2, threads_per_worker=1) as client:
+            dmap = DaskMap(client=client, shared={'scale': 3}, type_=list)
+            assert dmap(_scaled_sum, [[1], [2], [3]]) == [3, 6, 9]
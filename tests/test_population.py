@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 
+import numpy as np
+
 from pyrimidine.population import *
 from pyrimidine.individual import *
 
@@ -40,3 +42,287 @@ class TestPopultion:
         MyPopulation = HOFPopulation[MyIndividual] // 16
         assert MyPopulation.element_class == MyIndividual
 
+    def test_fitness_batch(self, example_problem):
+        _evaluate = example_problem
+        calls = []
+
+        class _Individual(MonoIndividual[BinaryChromosome // 10]):
+
+            @classmethod
+            def _fitness_batch(cls, genomes):
+                calls.append(genomes.shape)
+                return _evaluate(genomes)
+
+        p = (StandardPopulation[_Individual] // 8).random()
+        f = p.get_all_fitness()
+        assert calls == [(8, 10)]
+        assert list(f) == [i.fitness for i in p]
+        p.evolve(n_iter=2)
+
+        # the same type without the batch fitness
+        q = (StandardPopulation[(BinaryChromosome // 10).set_fitness(_evaluate)] // 8).random()
+        assert isinstance(f, np.ndarray) and isinstance(q.get_all_fitness(), np.ndarray)
+
+    def test_select(self, example):
+        ExamplePopulation, _ = example
+        for selection in ('tournament', 'tournament_with_replacement', 'sus', 'truncation'):
+            p = ExamplePopulation.random(n_individuals=12)
+            p.select(n_sel=8, selection=selection)
+            assert len(p) == 8
+            assert len(set(map(id, p))) == 8
+
+    def test_fitness_memo(self):
+        from pyrimidine.deco import memoize_fitness
+
+        @memoize_fitness(maxsize=100)
+        class _Chromosome(BinaryChromosome // 4):
+
+            @classmethod
+            def _fitness_batch(cls, genomes):
+                return genomes.sum(axis=1)
+
+        p = (StandardPopulation[_Chromosome] // 40).random()
+        f = p.get_all_fitness()
+        assert list(f) == [sum(c) for c in p]
+        memo = p.fitness_memo
+        assert memo.misses == len(np.unique(np.asarray(p.elements), axis=0))
+        # the fitness vector is cached by the population
+        assert p.get_all_fitness() is f
+        p.clear_cache()
+        p.get_all_fitness()
+        assert memo.hits >= 40
+
+    def test_fitness_vector(self):
+        calls = [0]
+
+        class _Chromosome(BinaryChromosome // 8):
+
+            def _fitness(self):
+                calls[0] += 1
+                return np.sum(self)
+
+        class _Population(StandardPopulation):
+            element_class = _Chromosome
+            default_size = 10
+
+        p = _Population.random()
+        p.mean_fitness, p.std_fitness, p.max_fitness, p.best_element, p.argsort()
+        assert calls[0] == 10
+        p.extend(_Population.random(n_elements=2))
+        assert p.mean_fitness == np.mean([np.sum(c) for c in p]) and calls[0] == 22
+        q = _Population.random()
+        f = q.get_all_fitness()
+        p.mutate()
+        assert list(p.get_all_fitness()) == [np.sum(c) for c in p]
+        # the cache of another population is kept
+        assert q.get_all_fitness() is f
+        p.evolve(n_iter=3)
+        assert list(p.get_all_fitness()) == [np.sum(c) for c in p]
+
+        # an element is replaced
+        p.max_fitness
+        c = p[0].copy()
+        c.mutate(indep_prob=1)
+        p[0] = c
+        assert list(p.get_all_fitness()) == [np.sum(c) for c in p]
+
+        # an element changes by its own method
+        p[1].mutate(indep_prob=1)
+        assert list(p.get_all_fitness()) == [np.sum(c) for c in p]
+        n = calls[0]
+        p.mean_fitness, p.max_fitness
+        assert calls[0] == n
+
+        # the chromosome of an individual changes
+        class _Individual(MonoIndividual):
+            element_class = _Chromosome
+
+            def _fitness(self):
+                return np.sum(self.chromosome)
+
+        q = (StandardPopulation[_Individual] // 5).random()
+        q.get_all_fitness()
+        q[0].chromosome.mutate(indep_prob=1)
+        q[1].mutate()
+        assert list(q.get_all_fitness()) == [i.fitness for i in q]
+
+    def test_fitness_vector_in_transition(self):
+
+        class _Chromosome(BinaryChromosome // 8):
+
+            def _fitness(self):
+                return np.sum(self)
+
+        class _Population(StandardPopulation):
+            element_class = _Chromosome
+            default_size = 10
+
+            def transition(self, *args, **kwargs):
+                self.max_fitness
+                # change the genomes in place
+                for c in self:
+                    c[:] = 0
+                self[-1][:] = 1
+                self.clear_cache()
+                self.maxima.append(self.max_fitness)
+                self.best.append(self.best_element is self[-1])
+
+        p = _Population.random()
+        p.maxima, p.best = [], []
+        p.max_fitness
+        p.transition()
+        p.max_fitness
+        p.transition()
+        assert p.maxima == [8, 8] and all(p.best)
+
+    def test_rank(self):
+
+        class _Chromosome(BinaryChromosome // 4):
+
+            def _fitness(self):
+                return np.sum(self)
+
+        class _Population(StandardPopulation):
+            element_class = _Chromosome
+            default_size = 30
+
+        p = _Population.random()
+        f = p.get_all_fitness()
+        n = len(p)
+        assert np.allclose(p.rank(tied=True), [(np.sum(f <= v) - 1) / n for v in f])
+        assert np.allclose(p.rank(dense=True), [np.sum(np.unique(f) < v) / n for v in f])
+        rankings = p.rank()
+        assert sorted(rankings * n) == list(range(n))
+        assert all(p.get_rank(c) == np.sum(f <= c.fitness) / n for c in p)
+
+    def test_rank_in_transition(self):
+
+        calls = [0]
+
+        class _Chromosome(BinaryChromosome // 4):
+
+            def _fitness(self):
+                calls[0] += 1
+                return np.sum(self)
+
+        class _Population(StandardPopulation):
+            element_class = _Chromosome
+            default_size = 10
+
+            def transition(self, *args, **kwargs):
+                self.rank()
+                n_calls = calls[0]
+                rankings = [self.get_rank(c) for c in self]
+                # only the fitness of the given individuals is computed
+                self.reused = calls[0] - n_calls == len(self)
+                # the cache is out of date after a mutation
+                self[0].mutate(indep_prob=1)
+                f = np.array([np.sum(c) for c in self])
+                self.correct = all(self.get_rank(c) == np.sum(f <= np.sum(c)) / len(self) for c in self)
+
+        p = _Population.random()
+        p.transition()
+        assert p.reused and p.correct
+
+    def test_async_fitness(self):
+        import asyncio
+
+        in_flight = [0, 0]
+
+        class _Chromosome(BinaryChromosome // 6):
+
+            async def _fitness(self):
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+                await asyncio.sleep(0.01)
+                in_flight[0] -= 1
+                return np.sum(self)
+
+        class _Population(StandardPopulation[_Chromosome] // 10):
+            max_concurrency = 4
+
+        p = _Population.random()
+        f = p.get_all_fitness()
+        assert list(f) == [np.sum(c) for c in p]
+        assert in_flight[1] == 4
+
+        async def main():
+            assert list(await p.aget_all_fitness()) == list(f)
+            await p.aevolve(n_iter=2)
+            return p.max_fitness
+
+        assert asyncio.run(main()) >= 0
+
+        # the event loops are reused
+        from pyrimidine.mixin import run_sync
+
+        async def _loop():
+            return asyncio.get_running_loop()
+
+        async def _loops():
+            return run_sync(_loop()), run_sync(_loop())
+
+        assert run_sync(_loop()) is run_sync(_loop())
+        a, b = asyncio.run(_loops())
+        assert a is b
+
+    def test_crossover(self, example):
+        ExamplePopulation, _ = example
+        p = ExamplePopulation.random()
+        n = len(p)
+        offspring = p.mate(mate_prob=1, crossover='two_point')
+        assert len(offspring) == n - 1 and len(p) == 2 * n - 1
+        assert all(isinstance(o, p.element_class) and o.chromosome.shape == p[0].chromosome.shape for o in offspring)
+
+    def test_hall_of_fame(self, example):
+        from pyrimidine.halloffame import HallOfFame
+
+        ExamplePopulation, _ = example
+
+        class _Population(HOFPopulation, ExamplePopulation):
+            params = {'hof_size': 3}
+
+        p = _Population.random()
+        p.init()
+        hof = p.hall_of_fame
+        assert isinstance(hof, HallOfFame) and len(hof) == 3
+        assert hof.max_fitness == np.max(p.get_all_fitness()) and p.max_fitness == hof.max_fitness
+        p.evolve(n_iter=3)
+        hof = p.hall_of_fame
+        assert list(hof.fitness_values) == sorted(i.fitness for i in hof)
+        assert p.best_individual is hof[-1] and not any(i is j for i in hof for j in p)
+
+        individual = p[0].copy()
+        hof = HallOfFame(maxsize=2, dedup=True)
+        hof.update([individual, individual.copy(), individual.copy()], [1, 1, 1])
+        assert len(hof) == 1 and hof.best is not individual
+
+    def test_checkpoint(self, tmp_path):
+        import random
+
+        class _Chromosome(BinaryChromosome // 8):
+
+            def _fitness(self):
+                return np.sum(self * np.arange(8))
+
+        # the local classes made by `//` can not be pickled
+        _Population = HOFPopulation[_Chromosome] // 10
+
+        stat = {'Best Fitness': 'max_fitness', 'Mean Fitness': 'mean_fitness'}
+        np.random.seed(1); random.seed(1)
+        data = _Population.random().evolve(n_iter=20, stat=stat, history=True)
+
+        np.random.seed(1); random.seed(1)
+        path = tmp_path / 'population.pkl'
+        counter = [0]
+        def control(o):
+            counter[0] += 1
+            return counter[0] == 13
+        _Population.random().evolve(n_iter=20, stat=stat, history=True,
+            checkpoint=path, checkpoint_period=10, control=control)
+        np.random.seed(2); random.seed(2)
+        p, resumed = _Population.resume(path, stat=stat)
+        assert type(p) is _Population and isinstance(p[0], _Chromosome)
+        assert len(p.hall_of_fame) > 0 and isinstance(p.hall_of_fame[0], _Chromosome)
+        assert isinstance(p.get_state()['genomes'], np.ndarray)
+        assert resumed.equals(data)
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 
+import numpy as np
+
 from pyrimidine import FloatChromosome, BasePopulation
 from pyrimidine.pso import Particle, ParticleSwarm
 from pyrimidine.benchmarks.special import rosenbrock
@@ -32,3 +34,81 @@ class TestPSO:
         
         assert isinstance(pop, MyParticleSwarm)
 
+
+    def test_matrix(self):
+
+        class _Particle(Particle):
+            element_class = FloatChromosome // 4
+
+            @classmethod
+            def _fitness_batch(cls, positions):
+                return - np.sum(positions ** 2, axis=1)
+
+        class MyParticleSwarm(ParticleSwarm):
+
+            element_class = _Particle
+            default_size = 10
+            params = {'max_velocity': 0.5}
+
+        pop = MyParticleSwarm.random()
+        pop.evolve(n_iter=20)
+        assert pop.positions.shape == pop.velocities.shape == (10, 4)
+        assert np.all(np.abs(pop.velocities) <= 0.5)
+        assert all(np.array_equal(p.position, x) for p, x in zip(pop.particles, pop.positions))
+        assert np.allclose(pop.best_fitness_values, - np.sum(pop.best_positions ** 2, axis=1))
+        assert pop.max_fitness == pop.best_fitness_values.max() == pop.best_particle.fitness
+
+    def test_reorder(self):
+
+        class _Particle(Particle):
+            element_class = FloatChromosome // 4
+
+            @classmethod
+            def _fitness_batch(cls, positions):
+                return - np.sum(positions ** 2, axis=1)
+
+        class MyParticleSwarm(ParticleSwarm):
+
+            element_class = _Particle
+            default_size = 10
+
+        pop = MyParticleSwarm.random()
+        pop.evolve(n_iter=5)
+        assert pop._is_stacked()
+        pop.particles = pop.particles[::-1]
+        assert not pop._is_stacked()
+        pop.transition()
+        assert pop._is_stacked()
+        assert all(np.shares_memory(p.position, x) for p, x in zip(pop.particles, pop.positions))
+        assert np.allclose(pop.best_fitness_values, - np.sum(pop.best_positions ** 2, axis=1))
+
+    def test_checkpoint(self, tmp_path):
+        import random
+
+        class _Particle(Particle):
+            element_class = FloatChromosome // 4
+
+            @classmethod
+            def _fitness_batch(cls, positions):
+                return - np.sum(positions ** 2, axis=1)
+
+        class MyParticleSwarm(ParticleSwarm):
+
+            element_class = _Particle
+            default_size = 10
+
+        np.random.seed(1); random.seed(1)
+        data = MyParticleSwarm.random().evolve(n_iter=20, history=True)
+
+        np.random.seed(1); random.seed(1)
+        path = tmp_path / 'pso.pkl'
+        counter = [0]
+        def control(o):
+            counter[0] += 1
+            return counter[0] == 13
+        MyParticleSwarm.random().evolve(n_iter=20, history=True, checkpoint=path, checkpoint_period=10, control=control)
+        np.random.seed(2); random.seed(2)
+        pop, resumed = MyParticleSwarm.resume(path)
+        assert pop._is_stacked()
+        assert np.allclose(pop.best_fitness_values, - np.sum(pop.best_positions ** 2, axis=1))
+        assert resumed.equals(data)